@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class ClusterLabel:
+    # scratch buffers reused between calls while the grid shape stays the same
+    padded = np.zeros((0, 0), dtype=bool)
+    changes = np.zeros((0, 0), dtype=bool)
+
+    @staticmethod
+    def count_clusters(mask):
+        """
+        Number of 4-connected clusters in a 2d boolean mask and the number of pixels in them.
+        Each row is split into runs of set pixels, runs that overlap a run of the row above are joined
+        with a union-find over the runs, and the clusters are the roots left at the end.
+        """
+        rows, starts, ends = ClusterLabel.__find_runs(mask)
+        num_runs = len(rows)
+        if num_runs == 0:
+            return 0, 0
+
+        parent = np.arange(num_runs)
+        below, above = ClusterLabel.__overlapping_runs(rows, starts, ends, mask.shape[1] + 2)
+        while len(below) > 0:
+            # hook the larger root of every pair under the smaller one, then flatten the trees
+            root_below = parent[below]
+            root_above = parent[above]
+            np.minimum.at(parent, np.maximum(root_below, root_above), np.minimum(root_below, root_above))
+            while True:
+                grand_parent = parent[parent]
+                if np.array_equal(grand_parent, parent):
+                    break
+                parent = grand_parent
+
+            joined = parent[below] != parent[above]
+            below = below[joined]
+            above = above[joined]
+
+        num_clusters = int(np.count_nonzero(parent == np.arange(num_runs)))
+        return num_clusters, int(np.sum(ends - starts))
+
+    @staticmethod
+    def __find_runs(mask):
+        # row, first column and one past the last column of each run of set pixels, in row major order
+        nrows, ncols = mask.shape
+        if ClusterLabel.padded.shape != (nrows, ncols + 2):
+            ClusterLabel.padded = np.zeros((nrows, ncols + 2), dtype=bool)
+            ClusterLabel.changes = np.zeros((nrows, ncols + 1), dtype=bool)
+        padded = ClusterLabel.padded
+        changes = ClusterLabel.changes
+
+        padded[:, 1:-1] = mask
+        np.not_equal(padded[:, 1:], padded[:, :-1], out=changes)
+        rows, cols = np.nonzero(changes)
+        # changes alternate between the start and the end of a run along each row
+        return rows[0::2], cols[0::2], cols[1::2]
+
+    @staticmethod
+    def __overlapping_runs(rows, starts, ends, width):
+        """
+        Pairs (run, run of the row above) that share a column. Keys of the form row * width + column
+        keep the runs of all rows in one sorted order, so every run finds its overlapping range with
+        two binary searches.
+        """
+        start_keys = rows * width + starts
+        end_keys = rows * width + ends
+        above_keys = (rows - 1) * width
+        first = np.searchsorted(end_keys, above_keys + starts, side='right')
+        last = np.searchsorted(start_keys, above_keys + ends, side='left')
+
+        num_overlaps = np.maximum(last - first, 0)
+        below = np.repeat(np.arange(len(rows)), num_overlaps)
+        offsets = np.arange(len(below)) - np.repeat(np.cumsum(num_overlaps) - num_overlaps, num_overlaps)
+        above = np.repeat(first, num_overlaps) + offsets
+        return below, above
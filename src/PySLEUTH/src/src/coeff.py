@@ -1,6 +1,7 @@
 from logger import Logger
 from scenario import Scenario
 from ugm_defines import UGMDefines
+from outputSink import OutputSink
 
 
 class CoeffInfo:
@@ -23,6 +24,7 @@ class Coeff:
     stop_coeff = CoeffInfo()
     best_fit_coeff = CoeffInfo()
     coeff_filename = ""
+    captured_lines = None  # coeff file lines held back while a monte carlo worker runs
 
     @staticmethod
     def set_saved_coeff(diffusion, spread, breed, slope_resistance, road_gravity):
@@ -61,14 +63,8 @@ class Coeff:
     @staticmethod
     def create_coeff_file(filename, overwrite):
         Coeff.coeff_filename = filename
-        if overwrite:
-            coeff_file = open(filename, "w")
-        else:
-            coeff_file = open(filename, "a")
-
         header = "  Run    MC Year Diffusion   Breed   Spread SlopeResist RoadGrav\n"
-        coeff_file.write(header)
-        coeff_file.close()
+        OutputSink.create(filename, header, overwrite)
 
     @staticmethod
     def get_current_diffusion():
@@ -351,17 +347,23 @@ class Coeff:
     @staticmethod
     def write_current_coeff(cur_run, cur_mc, cur_yr):
         if Scenario.get_scen_value('write_coeff_file'):
-            file = open(Coeff.coeff_filename, "a")
-
-            file.write(f"{cur_run: 5} "
-                       f"{cur_mc: 5} "
-                       f"{cur_yr: 4} "
-                       f"{Coeff.current_coefficient.diffusion: 8.2f} "
-                       f"{Coeff.current_coefficient.breed: 8.2f} "
-                       f"{Coeff.current_coefficient.spread: 8.2f} "
-                       f"{Coeff.current_coefficient.slope_resistance: 8.2f} "
-                       f"{Coeff.current_coefficient.road_gravity: 8.2f}\n")
-            file.close()
+            line = f"{cur_run: 5} " \
+                   f"{cur_mc: 5} " \
+                   f"{cur_yr: 4} " \
+                   f"{Coeff.current_coefficient.diffusion: 8.2f} " \
+                   f"{Coeff.current_coefficient.breed: 8.2f} " \
+                   f"{Coeff.current_coefficient.spread: 8.2f} " \
+                   f"{Coeff.current_coefficient.slope_resistance: 8.2f} " \
+                   f"{Coeff.current_coefficient.road_gravity: 8.2f}\n"
+            if Coeff.captured_lines is not None:
+                Coeff.captured_lines.append(line)
+            else:
+                Coeff.write_coeff_lines([line])
+
+    @staticmethod
+    def write_coeff_lines(lines):
+        if Scenario.get_scen_value('write_coeff_file') and len(lines) > 0:
+            OutputSink.write_lines(Coeff.coeff_filename, lines)
 
     @staticmethod
     def log_current():
@@ -8,6 +8,7 @@ from processing import Processing
 from imageIO import ImageIO
 from color import Color
 from timer import TimerUtility
+import numpy as np
 
 
 class Deltatron:
@@ -16,13 +17,14 @@ class Deltatron:
                   land_out, slope, drive, class_slope, ftransition):
         TimerUtility.start_timer('delta_deltatron')
 
+        Random.set_stream(Random.DELTATRON_PHASE1)
         phase1_land = Deltatron.phase1(drive, urban_land.gridData, slope.gridData, deltatron.gridData,
                                        landuse_classes, class_indices, new_indices, class_slope, ftransition)
 
+        Random.set_stream(Random.DELTATRON_PHASE2)
         phase2_land = Deltatron.phase2(urban_land.gridData, phase1_land, deltatron.gridData, landuse_classes, new_indices, ftransition)
 
-        for i in range(len(phase2_land)):
-            land_out.gridData[i] = phase2_land[i]
+        land_out.gridData[:] = phase2_land
 
         TimerUtility.stop_timer('delta_deltatron')
 
@@ -32,28 +34,32 @@ class Deltatron:
         TimerUtility.start_timer('delta_phase1')
         nrows = IGrid.nrows
         ncols = IGrid.ncols
-        phase1_land = []
+        num_classes = LandClass.get_num_landclasses()
+
         # Copy input land grid into output land grid
-        for urban in urban_land:
-            phase1_land.append(urban)
+        phase1_land = urban_land.copy()
+
+        # transition probability from class to class, and whether each landuse number is transitional
+        ftrans = [ftransition[k * num_classes:(k + 1) * num_classes] for k in range(num_classes)]
+        is_trans = Deltatron.get_transitional(landuse_classes, new_indices)
+
+        # Select the transition pixels to be the centers of the spreading clusters, all in one draw
+        transitional = np.flatnonzero(np.asarray(is_trans)[urban_land])
+        if len(transitional) == 0:
+            TimerUtility.stop_timer('delta_phase1')
+            return phase1_land
+        centers = transitional[Random.get_ints(drive, 0, len(transitional) - 1)].tolist()
 
         # Try to make Transitions
-        for tries in range(drive):
-            # Select a transition pixel to e center of spreading cluster
-            offset, i_center, j_center = Deltatron.get_rand_landuse_offset()
-            index = new_indices[urban_land[offset]]
-            while not landuse_classes[index].trans:
-                offset, i_center, j_center = Deltatron.get_rand_landuse_offset()
-                index = new_indices[urban_land[offset]]
+        for offset in centers:
+            i_center, j_center = divmod(offset, ncols)
 
             # Randomly choose new landuse number
             new_landuse = Deltatron.get_new_landuse(class_indices, landuse_classes, slope[offset], class_slope)
+            new_j = new_indices[new_landuse]
 
             # Test transition probability for new cluster
-            new_i = new_indices[urban_land[offset]]
-            new_j = new_indices[new_landuse]
-            trans_offset = new_i * LandClass.get_num_landclasses() + new_j
-            if Random.get_float() < ftransition[trans_offset]:
+            if Random.get_float() < ftrans[new_indices[urban_land[offset]]][new_j]:
                 # Transition the center pixel
                 phase1_land[offset] = new_landuse
                 deltatron[offset] = 1
@@ -72,15 +78,9 @@ class Deltatron:
                     if 0 <= i < nrows and 0 <= j < ncols:
                         # Test new pixel against transition probability
                         offset = i * ncols + j
-                        # print(f"{len(urban_land)} | {i} {j} -> {offset}")
-                        urban_index = urban_land[offset]
-                        new_i = new_indices[urban_index]
-                        new_j = new_indices[new_landuse]
-                        trans_offset = new_i * LandClass.get_num_landclasses() + new_j
-                        if Random.get_float() < ftransition[trans_offset]:
+                        if Random.get_float() < ftrans[new_indices[urban_land[offset]]][new_j]:
                             # If the immediate pixel is allowed to transition, then change it
-                            index = new_indices[urban_land[offset]]
-                            if landuse_classes[index].trans:
+                            if is_trans[urban_land[offset]]:
                                 phase1_land[offset] = new_landuse
                                 deltatron[offset] = 1
 
@@ -88,51 +88,63 @@ class Deltatron:
                             i, j = Utilities.get_neighbor(i, j)
                             if 0 <= i < nrows and 0 <= j < ncols:
                                 offset = i * ncols + j
-                                index = new_indices[urban_land[offset]]
-                                if landuse_classes[index].trans:
+                                if is_trans[urban_land[offset]]:
                                     phase1_land[offset] = new_landuse
                                     deltatron[offset] = 1
         TimerUtility.stop_timer('delta_phase1')
         return phase1_land
 
+    @staticmethod
+    def get_transitional(landuse_classes, new_indices):
+        # for every landuse number, whether its class may transition
+        return [new_index < len(landuse_classes) and landuse_classes[new_index].trans for new_index in new_indices]
+
     @staticmethod
     def phase2(urban_land, phase1_land, deltatron, landuse_classes, new_indices, ftransition):
         TimerUtility.start_timer('delta_phase2')
         nrows = IGrid.nrows
         ncols = IGrid.ncols
-        phase2_land = []
+        num_classes = LandClass.get_num_landclasses()
 
         # Copy current land to phase2_land
-        for pixel in phase1_land:
-            phase2_land.append(pixel)
-
-        # For each interior point
-        for i in range(1, nrows - 1):
-            for j in range(1, ncols - 1):
-                offset = i * ncols + j
-                index = new_indices[phase1_land[offset]]
-                if landuse_classes[index].trans and deltatron[offset] == 0:
-                    """
-                    I,J is a Transitional Pixel which was not transitioned within the last 
-                    min_years_between_transitions years; count its neighbors which have transitioned
-                    in previous year (IE Deltatron == 2)
-                    """
-                    deltatron_neighbors = Deltatron.count_neighbor(deltatron, i, j)
-                    random_int = 1 + Random.get_int(0, 1)
-                    if deltatron_neighbors >= random_int:
-                        max_tries = 16
-                        for tries in range(max_tries):
-                            i_neigh, j_neigh = Utilities.get_neighbor(i, j)
-                            offset_neigh = i_neigh * ncols + j_neigh
-                            index = new_indices[phase1_land[offset_neigh]]
-                            if deltatron[offset_neigh] == 2 and landuse_classes[index]:
-                                trans_i = new_indices[phase2_land[offset]]
-                                trans_j = new_indices[urban_land[offset_neigh]]
-                                offset_trans = trans_i * LandClass.get_num_landclasses() + trans_j
-                                if Random.get_float() < ftransition[offset_trans]:
-                                    phase2_land[offset] = urban_land[offset_neigh]
-                                    deltatron[offset] = 1
-                                break
+        phase2_land = phase1_land.copy()
+
+        """
+        Transitional interior pixels which were not transitioned within the last min_years_between_transitions
+        years, in the order the pixel loop visits them. Each takes one draw to compare with its count of
+        neighbors which have transitioned in the previous year (IE Deltatron == 2), so only pixels with such
+        neighbors need the stochastic tests, the draws of the others are skipped over.
+        """
+        is_trans = np.asarray(Deltatron.get_transitional(landuse_classes, new_indices))
+        delta_2d = deltatron.reshape(nrows, ncols)
+        eligible = is_trans[phase1_land].reshape(nrows, ncols) & (delta_2d == 0)
+        eligible[[0, -1], :] = False
+        eligible[:, [0, -1]] = False
+        eligible = np.flatnonzero(eligible)
+
+        deltatron_neighbors = Deltatron.count_neighbors(deltatron, nrows, ncols)[eligible]
+        candidates = np.flatnonzero(deltatron_neighbors > 0)
+        skipped = np.diff(candidates, prepend=-1) - 1
+
+        for k, skip in zip(candidates.tolist(), skipped.tolist()):
+            Random.skip(skip)
+            offset = int(eligible[k])
+            random_int = 1 + Random.get_int(0, 1)
+            if deltatron_neighbors[k] >= random_int:
+                i, j = divmod(offset, ncols)
+                max_tries = 16
+                for tries in range(max_tries):
+                    i_neigh, j_neigh = Utilities.get_neighbor(i, j)
+                    offset_neigh = i_neigh * ncols + j_neigh
+                    if deltatron[offset_neigh] == 2:
+                        trans_i = new_indices[phase2_land[offset]]
+                        trans_j = new_indices[urban_land[offset_neigh]]
+                        offset_trans = trans_i * num_classes + trans_j
+                        if Random.get_float() < ftransition[offset_trans]:
+                            phase2_land[offset] = urban_land[offset_neigh]
+                            deltatron[offset] = 1
+                        break
+
         if Scenario.get_scen_value('view_deltatron_aging'):
             if IGrid.using_gif:
                 filename = f"{Scenario.get_scen_value('output_dir')}deltatron_{Processing.get_current_run()}_" \
@@ -145,9 +157,7 @@ class Deltatron:
             ImageIO.write_gif(deltatron, Color.get_deltatron_table(), filename, date, nrows, ncols)
 
         # Age the Deltatrons
-        for i in range(nrows * ncols):
-            if deltatron[i] > 0:
-                deltatron[i] += 1
+        deltatron[deltatron > 0] += 1
 
         # Kill old deltatrons
         Utilities.condition_gt_gif(deltatron, UGMDefines.MIN_YEARS_BETWEEN_TRANSITIONS, deltatron, 0)
@@ -157,15 +167,6 @@ class Deltatron:
 
 
 
-    @staticmethod
-    def get_rand_landuse_offset():
-        nrows = IGrid.nrows
-        ncols = IGrid.ncols
-
-        i_center = Random.get_int(0, nrows - 1)
-        j_center = Random.get_int(0, ncols - 1)
-        return int(i_center * ncols + j_center), i_center, j_center
-
     @staticmethod
     def get_new_landuse(class_indices, landuse_classes, local_slope, class_slope):
 
@@ -184,14 +185,14 @@ class Deltatron:
         return new_landuse
 
     @staticmethod
-    def count_neighbor(deltatron, row, col):
+    def count_neighbors(deltatron, nrows, ncols):
+        """
+        For every pixel, its neighbors with deltatron age 2. The upper left neighbor is counted twice, as
+        it appears twice in the neighbor options. Border pixels get 0, they are never tested.
+        """
         neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
-        neigh_count = 0
+        age_2 = (deltatron.reshape(nrows, ncols) == 2).astype(np.int8)
+        counts = np.zeros((nrows, ncols), dtype=np.int8)
         for x, y in neighbor_options:
-            neighbor_row = row + x
-            neighbor_col = col + y
-            offset = neighbor_row * IGrid.ncols + neighbor_col
-            if deltatron[offset] == 2:
-                neigh_count += 1
-
-        return neigh_count
\ No newline at end of file
+            counts[1:-1, 1:-1] += age_2[1 + x:nrows - 1 + x, 1 + y:ncols - 1 + y]
+        return counts.ravel()
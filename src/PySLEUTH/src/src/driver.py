@@ -6,11 +6,21 @@ from igrid import IGrid
 from pgrid import PGrid
 from coeff import Coeff
 from stats import Stats
+from statsAccumulator import StatsAccumulator
+from resultsStore import ResultsStore
+from outputSink import OutputSink
 from growth import Grow
 from color import Color
 from imageIO import ImageIO
 from utilities import Utilities
 from timer import TimerUtility
+from logger import Logger
+from output import Output
+from ugm_defines import UGMDefines
+import numpy as np
+import multiprocessing
+import io
+import sys
 
 
 class Driver:
@@ -78,6 +88,8 @@ class Driver:
             fmatch = Driver.fmatch(sim_landuse, landuse1, landuse_flag, total_pixels)
 
         Stats.analyze(fmatch)
+        # a run is complete, put its log lines on disk
+        OutputSink.flush()
         TimerUtility.stop_timer('drv_driver')
 
         # Need to call Total_Time timer in main.c to stop from overflowing
@@ -86,54 +98,179 @@ class Driver:
 
     @staticmethod
     def monte_carlo(cumulate, land1):
-        log_it = Scenario.get_scen_value("logging")
-
         z = PGrid.get_z()
         total_pixels = IGrid.get_total_pixels()
         num_monte_carlo = int(Scenario.get_scen_value("monte_carlo_iterations"))
 
-        for imc in range(num_monte_carlo):
-            Processing.set_current_monte(imc)
-
-            '''print("--------Saved-------")
-            print(Coeff.get_saved_diffusion())
-            print(Coeff.get_saved_spread())
-            print(Coeff.get_saved_breed())
-            print(Coeff.get_saved_slope_resistance())
-            print(Coeff.get_saved_road_gravity())
-            print("--------------------")'''
-
-            # Reset the Parameters
-            Coeff.set_current_diffusion(Coeff.get_saved_diffusion())
-            Coeff.set_current_spread(Coeff.get_saved_spread())
-            Coeff.set_current_breed(Coeff.get_saved_breed())
-            Coeff.set_current_slope_resistance(Coeff.get_saved_slope_resistance())
-            Coeff.set_current_road_gravity(Coeff.get_saved_road_gravity())
-
-            if log_it and Scenario.get_scen_value("log_initial_coefficients"):
-                Coeff.log_current()
-
-            # Run Simulation
-            Stats.init_urbanization_attempts()
-            TimerUtility.start_timer('grw_growth')
-            Grow.grow(z, land1)
-            TimerUtility.stop_timer('grw_growth')
-
-            if log_it and Scenario.get_scen_value("log_urbanization_attempts"):
-                Stats.log_urbanization_attempts()
-
-            # Update Cumulate Grid
-            for i in range(total_pixels):
-                if z.gridData[i] > 0:
-                    cumulate.gridData[i] += 1
-
-            # Update Annual Land Class Probabilities
-            if Processing.get_processing_type() == Globals.mode_enum["predict"]:
-                LandClass.update_annual_prob(land1.gridData, total_pixels)
+        if Globals.workers > 1 and num_monte_carlo > 1:
+            Driver.parallel_monte_carlo(cumulate, z, land1, num_monte_carlo)
+        else:
+            for imc in range(num_monte_carlo):
+                Driver.run_monte_carlo(imc, z, land1)
+
+                # Update Cumulate Grid
+                cumulate.gridData[z.gridData > 0] += 1
+
+                # Update Annual Land Class Probabilities
+                if Processing.get_processing_type() == Globals.mode_enum["predict"]:
+                    LandClass.update_annual_prob(land1.gridData, total_pixels)
 
         # Normalize Cumulative Urban Image
-        for i in range(total_pixels):
-            cumulate.gridData[i] = (100 * cumulate.gridData[i]) / num_monte_carlo
+        cumulate.gridData[:] = (100 * cumulate.gridData) / num_monte_carlo
+
+    @staticmethod
+    def run_monte_carlo(imc, z, land1):
+        log_it = Scenario.get_scen_value("logging")
+        Processing.set_current_monte(imc)
+
+        # Reset the Parameters
+        Coeff.set_current_diffusion(Coeff.get_saved_diffusion())
+        Coeff.set_current_spread(Coeff.get_saved_spread())
+        Coeff.set_current_breed(Coeff.get_saved_breed())
+        Coeff.set_current_slope_resistance(Coeff.get_saved_slope_resistance())
+        Coeff.set_current_road_gravity(Coeff.get_saved_road_gravity())
+
+        if log_it and Scenario.get_scen_value("log_initial_coefficients"):
+            Coeff.log_current()
+
+        # Run Simulation
+        Stats.init_urbanization_attempts()
+        TimerUtility.start_timer('grw_growth')
+        Grow.grow(z, land1)
+        TimerUtility.stop_timer('grw_growth')
+
+        if log_it and Scenario.get_scen_value("log_urbanization_attempts"):
+            Stats.log_urbanization_attempts()
+
+    @staticmethod
+    def parallel_monte_carlo(cumulate, z, land1, num_monte_carlo):
+        """
+        Runs the monte carlo replicas on a pool of forked workers that share the loaded input grids.
+        Each worker hands back its final z and land1 grids along with its stats accumulator, timer totals,
+        coeff lines, log text and yearly urban masks it produced, which are merged here in monte carlo order.
+        """
+        total_pixels = IGrid.get_total_pixels()
+        landuse_flag = len(Scenario.get_scen_value("landuse_data_file")) > 0
+
+        # anything still buffered would otherwise be written again by the workers
+        if Logger.log_opened:
+            Logger.logfile.flush()
+        sys.stdout.flush()
+        OutputSink.flush()
+
+        with multiprocessing.get_context("fork").Pool(min(Globals.workers, num_monte_carlo)) as pool:
+            for imc, result in enumerate(pool.imap(Driver.monte_carlo_worker, range(num_monte_carlo))):
+                z_data, land1_data, accumulator, timer_totals, coeff_lines, urban_history, log_text, echo_text = result
+                Processing.set_current_monte(imc)
+
+                if Logger.log_opened:
+                    Logger.logfile.write(log_text)
+                sys.stdout.write(echo_text)
+
+                Stats.accumulator.merge(accumulator)
+                TimerUtility.add_totals(timer_totals)
+                Coeff.write_coeff_lines(coeff_lines)
+
+                if not landuse_flag:
+                    for year, urban in urban_history:
+                        Processing.set_current_year(year)
+                        Grow.grow_non_landuse(np.unpackbits(urban, count=total_pixels))
+
+                z.gridData[:] = z_data
+                land1.gridData[:] = land1_data
+
+                # Update Cumulate Grid
+                cumulate.gridData[z.gridData > 0] += 1
+
+                # Update Annual Land Class Probabilities
+                if Processing.get_processing_type() == Globals.mode_enum["predict"]:
+                    LandClass.update_annual_prob(land1.gridData, total_pixels)
+
+        Processing.set_current_year(Processing.get_stop_year())
+
+    @staticmethod
+    def monte_carlo_worker(imc):
+        # capture everything the replica would write so the parent can merge it in order
+        Logger.logfile = io.StringIO()
+        sys.stdout = io.StringIO()
+        Stats.accumulator = StatsAccumulator()
+        Coeff.captured_lines = []
+        Grow.urban_history = []
+        timers = TimerUtility.get_totals()
+
+        z = PGrid.get_z()
+        land1 = PGrid.get_land1()
+        Driver.run_monte_carlo(imc, z, land1)
+
+        return z.gridData.copy(), land1.gridData.copy(), Stats.accumulator, TimerUtility.get_totals(timers), \
+            Coeff.captured_lines, Grow.urban_history, Logger.logfile.getvalue(), sys.stdout.getvalue()
+
+    @staticmethod
+    def parallel_calibrate(coeff_runs, restart_run):
+        """
+        Sends the calibration runs to a pool of forked workers that already hold the decoded inputs and base
+        statistics. Each worker hands back the log, echo, timer totals, coeff, stats file and results store output
+        of its run, which is written here in run order.
+        """
+        output_dir = Scenario.get_scen_value('output_dir')
+        first_run = Processing.get_current_run()
+        tasks = [(i, first_run + i, coeffs) for i, coeffs in enumerate(coeff_runs)]
+
+        # anything still buffered would otherwise be written again by the workers
+        if Logger.log_opened:
+            Logger.logfile.flush()
+        sys.stdout.flush()
+        OutputSink.flush()
+
+        with multiprocessing.get_context("fork").Pool(min(Globals.workers, len(tasks))) as pool:
+            for task, result in zip(tasks, pool.imap(Driver.calibrate_worker, tasks)):
+                diffusion_coeff, breed_coeff, spread_coeff, slope_resist_coeff, road_grav_coeff = task[2]
+                log_text, echo_text, timer_totals, coeff_lines, stats_writes, results_rows = result
+
+                filename = f"{output_dir}{UGMDefines.RESTART_FILE}{Globals.mype}"
+                Output.write_restart_data(filename, diffusion_coeff, breed_coeff, spread_coeff, slope_resist_coeff,
+                                          road_grav_coeff, Scenario.get_scen_value('random_seed'), restart_run)
+                restart_run += 1
+
+                if Logger.log_opened:
+                    Logger.logfile.write(log_text)
+                sys.stdout.write(echo_text)
+                TimerUtility.add_totals(timer_totals)
+                Coeff.write_coeff_lines(coeff_lines)
+                for filename, text in stats_writes:
+                    Stats.append_to_file(filename, text)
+                for filename, row in results_rows:
+                    ResultsStore.add_run(filename, row)
+                OutputSink.flush()
+
+                Processing.increment_num_runs_exec_this_cpu()
+                Processing.increment_current_run()
+
+    @staticmethod
+    def calibrate_worker(task):
+        num_runs_done, run, coeffs = task
+        diffusion_coeff, breed_coeff, spread_coeff, slope_resist_coeff, road_grav_coeff = coeffs
+        log_it = Scenario.get_scen_value("logging")
+
+        # the monte carlo iterations of a calibration run stay in this worker
+        Globals.workers = 1
+        Logger.logfile = io.StringIO()
+        sys.stdout = io.StringIO()
+        Coeff.captured_lines = []
+        Stats.captured_writes = []
+        ResultsStore.captured_rows = []
+        timers = TimerUtility.get_totals()
+
+        Processing.set_current_run(run)
+        Processing.set_num_runs_exec_this_cpu(num_runs_done)
+        Coeff.set_current_coeff(diffusion_coeff, spread_coeff, breed_coeff, slope_resist_coeff, road_grav_coeff)
+        Driver.driver()
+        # Timing Logs
+        if log_it and int(Scenario.get_scen_value('log_timings')) > 1:
+            TimerUtility.log_timers()
+
+        return Logger.logfile.getvalue(), sys.stdout.getvalue(), TimerUtility.get_totals(timers), \
+            Coeff.captured_lines, Stats.captured_writes, ResultsStore.captured_rows
 
     @staticmethod
     def fmatch(cum_probability, landuse1, landuse_flag, total_pixels):
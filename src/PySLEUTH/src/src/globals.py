@@ -1,6 +1,7 @@
 class Globals:
     mype = -1
     npes = -1
+    workers = 1
     mode_enum = {
         "predict": 0,
         "restart": 1,
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Grid:
 
     def __init__(self):
@@ -14,18 +17,15 @@ class Grid:
         self.filename = ""
         self.base = ""
         self.year = -1
-        self.gridData = []
+        self.gridData = np.zeros(0, dtype=np.uint8)
 
-    def init_grid_data(self, length):
-        self.gridData = [0 for i in list(range(length))]
+    def init_grid_data(self, length, dtype=np.uint8):
+        # grids are stored as flat typed arrays, 8 bits per pixel unless a wider type is asked for
+        self.gridData = np.zeros(length, dtype=dtype)
 
     def fill_histogram(self):
-        # fill histograms with 0s
-        self.histogram = [0 for i in list(range(256))]
-
-        # add a count for each data in grid data to the histogram
-        for data in self.gridData:
-            self.histogram[data] += 1
+        # count each data value in grid data, one bin per possible pixel value
+        self.histogram = np.bincount(self.gridData, minlength=256)
 
     def log_grid(self):
         basic_info = f"filename = {self.filename}\n" \
@@ -50,7 +50,7 @@ class Grid:
         return basic_info + header + grid_info + "\n"
 
     def clear_gridData(self):
-        self.gridData = []
+        self.gridData = np.zeros(0, dtype=self.gridData.dtype)
 
     def __str__(self):
         basic_info = "   " + str(self.packed) + " " + self.filename + " " + str(self.year) + "\n"
@@ -14,13 +14,19 @@ from pgrid import PGrid
 from transition import Transition
 from delta import Deltatron
 from grid import Grid
-from input import Input
-from output import Output
+import numpy as np
 import os
 import sys
 
 
 class Grow:
+    urban_history = None  # (year, packed urban mask) list when a monte carlo worker defers grow_non_landuse
+    # largest per year monte carlo count array kept in memory, in bytes, larger ones are memory mapped
+    MAX_IN_MEMORY_COUNTS = 1 << 30
+    monte_carlo_counts = None  # per year count of the monte carlos that made each pixel urban
+    monte_carlo_counts_year = 0  # year of the first row of monte_carlo_counts
+    monte_carlo_counts_file = ""  # backing file when monte_carlo_counts is memory mapped
+
     @staticmethod
     def grow(z, land1):
         deltatron = PGrid.get_deltatron()
@@ -38,6 +44,7 @@ class Grow:
 
         seed = IGrid.igrid.get_urban_grid(0)
         Utilities.condition_gif(seed, z.gridData)
+        Stats.reset_tracker(z.gridData)
 
         if Scenario.get_scen_value('echo'):
             print("******************************************")
@@ -97,6 +104,8 @@ class Grow:
 
             if len(Scenario.get_scen_value('landuse_data_file')) > 0:
                 Grow.grow_landuse(land1, num_growth_pix)
+            elif Grow.urban_history is not None:
+                Grow.urban_history.append((cur_yr, np.packbits(z.gridData > 0)))
             else:
                 Grow.grow_non_landuse(z.gridData)
 
@@ -115,18 +124,15 @@ class Grow:
         total_pixels = IGrid.nrows * IGrid.ncols
 
         # Initialize Deltatron Grid to Zero
-        for pixel in deltatron:
-            pixel = 0
+        deltatron[:] = 0
 
         if Processing.get_processing_type() == Globals.mode_enum['predict']:
             landuse = IGrid.igrid.get_landuse_igrid(1)
-            for i in range(total_pixels):
-                land1[i] = landuse[i]
+            land1[:] = landuse
 
         else:
             landuse = IGrid.igrid.get_landuse_igrid(0)
-            for i in range(total_pixels):
-                land1[i] = landuse[i]
+            land1[:] = landuse
 
     @staticmethod
     def grow_landuse(land1, num_growth_pix):
@@ -154,12 +160,11 @@ class Grow:
                                 slope, num_growth_pix, class_slope, ftransition)
 
             # Switch the old to the new
-            for i in range(len(land2.gridData)):
-                land1.gridData[i] = land2.gridData[i]
+            land1.gridData[:] = land2.gridData
 
-        if Processing.get_processing_type() == Globals.mode_enum['predict'] or \
-            (Processing.get_processing_type() == Globals.mode_enum['test'] and
-             Processing.get_current_monte() == Processing.get_last_monte()):
+        # every monte carlo writes the same file names, so only the last one's images are kept
+        if Processing.get_processing_type() in (Globals.mode_enum['predict'], Globals.mode_enum['test']) and \
+                Processing.get_current_monte() == Processing.get_last_monte():
             #Write land1 to file
             if IGrid.using_gif:
                 filename = f"{Scenario.get_scen_value('output_dir')}{IGrid.igrid.location}_land_n_urban" \
@@ -179,35 +184,49 @@ class Grow:
     @staticmethod
     def grow_non_landuse(z):
         num_monte = int(Scenario.get_scen_value('monte_carlo_iterations'))
-        cumulate_monte_carlo = Grid()
-        filename = f"{Scenario.get_scen_value('output_dir')}cumulate_monte_carlo.year_{Processing.get_current_year()}"
+        cur_yr = Processing.get_current_year()
 
         if Processing.get_processing_type() != Globals.mode_enum['calibrate']:
-            if Processing.get_current_monte() == 0:
-                # Zero out accumulation grid
-                cumulate_monte_carlo.init_grid_data(IGrid.total_pixels)
-            else:
-                Input.read_file_to_grid(filename, cumulate_monte_carlo)
+            if Processing.get_current_monte() == 0 and Grow.monte_carlo_counts is None:
+                # Zero out accumulation counts, one row per simulated year
+                Grow.init_monte_carlo_counts(cur_yr, Processing.get_stop_year(), num_monte)
 
             # Accumulate Z over monte carlos
-            for i in range(IGrid.total_pixels):
-                if z[i] > 0:
-                    cumulate_monte_carlo.gridData[i] += 1
+            counts = Grow.monte_carlo_counts[cur_yr - Grow.monte_carlo_counts_year]
+            counts[z > 0] += 1
 
             if Processing.get_current_monte() == num_monte - 1:
+                cumulate_monte_carlo = Grid()
+                cumulate_monte_carlo.gridData = counts.astype(np.float64)
                 if Processing.get_processing_type() == Globals.mode_enum['test']:
                     Utilities.condition_gt_gif(z, 0, cumulate_monte_carlo.gridData, 100)
                 else:
                     # Normalize Accumulated grid
-                    for i in range(IGrid.total_pixels):
-                        cumulate_monte_carlo.gridData[i] = 100 * cumulate_monte_carlo.gridData[i] / num_monte
+                    cumulate_monte_carlo.gridData[:] = 100 * cumulate_monte_carlo.gridData / num_monte
 
                 Utilities.write_z_prob_grid(cumulate_monte_carlo, "_urban_")
-                if Processing.get_current_monte() != 0:
-                    os.remove(filename)
-            else:
-                # Dump accumulated grid to disk
-                Output.write_grid_to_file(filename, cumulate_monte_carlo)
+                if cur_yr == Processing.get_stop_year():
+                    Grow.free_monte_carlo_counts()
+
+    @staticmethod
+    def init_monte_carlo_counts(first_year, stop_year, num_monte):
+        shape = (stop_year - first_year + 1, IGrid.total_pixels)
+        dtype = np.uint16 if num_monte <= np.iinfo(np.uint16).max else np.uint32
+        Grow.monte_carlo_counts_year = first_year
+        if shape[0] * shape[1] * np.dtype(dtype).itemsize <= Grow.MAX_IN_MEMORY_COUNTS:
+            Grow.monte_carlo_counts = np.zeros(shape, dtype=dtype)
+        else:
+            # too large to hold, keep the counts in a binary file mapped into memory
+            Grow.monte_carlo_counts_file = f"{Scenario.get_scen_value('output_dir')}cumulate_monte_carlo.npy"
+            Grow.monte_carlo_counts = np.lib.format.open_memmap(Grow.monte_carlo_counts_file, mode="w+",
+                                                                dtype=dtype, shape=shape)
+
+    @staticmethod
+    def free_monte_carlo_counts():
+        Grow.monte_carlo_counts = None
+        if Grow.monte_carlo_counts_file:
+            os.remove(Grow.monte_carlo_counts_file)
+            Grow.monte_carlo_counts_file = ""
 
     @staticmethod
     def completion_status():
@@ -1,6 +1,8 @@
 from grid import Grid
+import numpy as np
 import sys
 import os
+import io
 from globals import Globals
 from ugm_defines import UGMDefines
 from imageIO import ImageIO
@@ -10,6 +12,8 @@ from landClass import LandClass
 from scenario import Scenario
 from input import Input
 from output import Output
+from roadIndex import RoadSearchIndex, RoadNetwork
+from inputCache import InputCache
 
 class IGrid:
     igrid = None
@@ -21,6 +25,10 @@ class IGrid:
     nrows = -1
     ncols = -1
     using_gif = True
+    input_cache_path = ""  # cache entry for this input set, empty when caching is off
+    decoded_roads = None  # road grids as read, kept for the cache until it is saved
+    cached_roads = None  # normalized roads from the cache
+    validation_log = None  # log of the validation the inputs passed, None until they are validated
 
     @staticmethod
     def init(packing, processing_type):
@@ -205,6 +213,15 @@ class IGrid:
 
     @staticmethod
     def read_input_files(packing, save_echo_image, outputdir):
+        cache_dir = Scenario.get_scen_value('input_cache_dir')
+        if cache_dir:
+            key = InputCache.get_key(IGrid.get_input_grids(), IGrid.get_input_cache_settings())
+            IGrid.input_cache_path = InputCache.get_path(cache_dir, key)
+            entry = InputCache.load(IGrid.input_cache_path, Scenario.get_scen_value('input_cache_shared'))
+            if entry is not None:
+                IGrid.load_input_cache(entry, save_echo_image, outputdir)
+                return
+
         IGrid.read_input_file(IGrid.igrid.urban, packing, save_echo_image, outputdir)
         IGrid.read_input_file(IGrid.igrid.road, packing, save_echo_image, outputdir)
         IGrid.read_input_file(IGrid.igrid.landuse, packing, save_echo_image, outputdir)
@@ -214,15 +231,64 @@ class IGrid:
 
         IGrid.count_road_pixels()
         IGrid.calculate_percent_roads()
+        if IGrid.input_cache_path:
+            IGrid.decoded_roads = [road.gridData.copy() for road in IGrid.igrid.road]
         '''for grid in IGrid.igrid.urban:
             print(grid.filename)
             IGrid.read_into_grid(grid.filename, grid, save_echo_image, packing)
             grid.fill_histogram()'''
 
+    @staticmethod
+    def get_input_cache_settings():
+        # validation checks the landuse classes, and only logs and checks landuse when logging is on
+        return [f"logging {Scenario.get_scen_value('logging')}"] + \
+            [f"landuse_class {landuse_class}" for landuse_class in Scenario.get_scen_value('landuse_class_info')]
+
+    @staticmethod
+    def get_input_grids():
+        return IGrid.igrid.urban + IGrid.igrid.road + IGrid.igrid.landuse + \
+            [IGrid.igrid.excluded, IGrid.igrid.slope, IGrid.igrid.background]
+
+    @staticmethod
+    def load_input_cache(entry, save_echo_image, outputdir):
+        # the roads are held back until normalize_roads so echoes and logs still see the decoded values
+        for i, grid in enumerate(IGrid.get_input_grids()):
+            grid.gridData = entry[f"grid_{i}"]
+            grid.histogram = entry["histograms"][i]
+            grid.min, grid.max = entry["min_max"][i].tolist()
+            if save_echo_image and Globals.mype == 0:
+                IGrid.echo_input(grid, outputdir, grid.filename)
+
+        IGrid.road_pixel_count = entry["road_pixel_count"].tolist()
+        IGrid.percent_road = entry["percent_road"].tolist()
+        IGrid.excld_count = int(entry["excld_count"])
+        IGrid.cached_roads = [entry[f"road_{i}"] for i in range(IGrid.igrid.get_num_road())]
+        IGrid.validation_log = str(entry["validation_log"])
+
+    @staticmethod
+    def save_input_cache():
+        # store the prepared inputs unless caching is off or they came from the cache
+        if IGrid.input_cache_path and IGrid.cached_roads is None:
+            num_urban = IGrid.igrid.get_num_urban()
+            decoded = [grid.gridData for grid in IGrid.get_input_grids()]
+            decoded[num_urban:num_urban + IGrid.igrid.get_num_road()] = IGrid.decoded_roads
+            InputCache.save(IGrid.input_cache_path, IGrid.get_input_grids(), decoded,
+                            [road.gridData for road in IGrid.igrid.road], IGrid.road_pixel_count,
+                            IGrid.percent_road, IGrid.excld_count, IGrid.validation_log)
+            IGrid.decoded_roads = None
+
+            if Scenario.get_scen_value('input_cache_shared'):
+                # swap the private copies for the mapped entry so this run shares it too
+                entry = InputCache.load(IGrid.input_cache_path, True)
+                for i, grid in enumerate(IGrid.get_input_grids()):
+                    grid.gridData = entry[f"grid_{i}"]
+                for i, road in enumerate(IGrid.igrid.road):
+                    road.gridData = entry[f"road_{i}"]
+
     @staticmethod
     def read_input_file(gif_grids, packing, save_echo_image, outputdir):
         for grid in gif_grids:
-            grid.gridData = [0] * IGrid.total_pixels
+            grid.init_grid_data(IGrid.total_pixels)
             IGrid.read_into_grid(grid.filename, grid, save_echo_image, packing, outputdir)
             grid.fill_histogram()
 
@@ -283,6 +349,16 @@ class IGrid:
 
     @staticmethod
     def validate_grids(log_it):
+        if IGrid.validation_log is not None:
+            # cached inputs were validated before they were stored, only their log is repeated
+            if log_it:
+                Logger.log(IGrid.validation_log, end="")
+            return
+
+        # keep the validation log so a cache entry can repeat it
+        logfile = Logger.logfile
+        if log_it:
+            Logger.logfile = io.StringIO()
         try:
             # validate urban
             IGrid.validate_histogram(log_it, IGrid.igrid.urban, "urban")
@@ -303,6 +379,9 @@ class IGrid:
                 Logger.log("******************************************************")
         except ValueError:
             if log_it:
+                validation_log = Logger.logfile.getvalue()
+                Logger.logfile = logfile
+                Logger.log(validation_log, end="")
                 Logger.log("\nError")
                 Logger.log("Input data images contain errors.")
                 Logger.close()
@@ -311,6 +390,12 @@ class IGrid:
                 print("Input data images contain errors")
             sys.exit(1)
 
+        IGrid.validation_log = ""
+        if log_it:
+            IGrid.validation_log = Logger.logfile.getvalue()
+            Logger.logfile = logfile
+            Logger.log(IGrid.validation_log, end="")
+
     @staticmethod
     def validate_histogram(log_it, grids, grids_name):
         for grid in grids:
@@ -365,20 +450,13 @@ class IGrid:
         road_count = IGrid.igrid.get_num_road()
         for i in range(road_count):
             roads = IGrid.igrid.get_road_grid(i)
-            count = 0
-            for j in range(IGrid.total_pixels):
-                if roads[j] > 0:
-                    count += 1
-            IGrid.road_pixel_count[i] = count
+            IGrid.road_pixel_count[i] = int(np.count_nonzero(roads))
 
     @staticmethod
     def calculate_percent_roads():
         excld_grid = IGrid.igrid.get_excld_grid()
 
-        count = 0
-        for i in range(IGrid.total_pixels):
-            if excld_grid[i] >= 100:
-                count += 1
+        count = int(np.count_nonzero(excld_grid >= 100))
 
         IGrid.excld_count = count
 
@@ -396,18 +474,27 @@ class IGrid:
                             in IGrid.igrid.road])
         test_file = open(f"{Scenario.get_scen_value('output_dir')}testRoadNormalize", 'w')
         test_file.write(f"Max Road: {max_road_max}\n")
-        for road in IGrid.igrid.road:
+        for i, road in enumerate(IGrid.igrid.road):
             test_file.write("*****************************\n")
             norm_factor = float(road.max) / float(max_road_max)
             test_file.write(f"image_max: {road.max}\n")
             test_file.write(f"norm_factor: {norm_factor}\n")
-            for i in range(IGrid.total_pixels):
-                cur_pixel = road.gridData[i]
-                road.gridData[i] = int(((100 * cur_pixel) / road.max) * norm_factor)
-                test_file.write(f"{cur_pixel} => {road.gridData[i]}\n")
+            if IGrid.cached_roads is not None:
+                road.gridData = IGrid.cached_roads[i]
+            else:
+                # scale in double precision, then truncate back into the 8 bit road grid
+                road.gridData[:] = ((100.0 * road.gridData) / road.max) * norm_factor
 
         test_file.close()
 
+    @staticmethod
+    def index_roads():
+        # build the road search index and road graph once per normalized road grid
+        IGrid.igrid.road_search = [RoadSearchIndex(road.gridData, IGrid.nrows, IGrid.ncols)
+                                   for road in IGrid.igrid.road]
+        IGrid.igrid.road_network = [RoadNetwork(road.gridData, IGrid.nrows, IGrid.ncols)
+                                    for road in IGrid.igrid.road]
+
     @staticmethod
     def verify_inputs(log_it, landuse_flag):
         if log_it:
@@ -527,6 +614,8 @@ class IGridInfo:
 
         self.urban = []  # list of grid objects
         self.road = []  # list of grid objects
+        self.road_search = []  # RoadSearchIndex per road grid
+        self.road_network = []  # RoadNetwork per road grid
         self.landuse = []  # list of grid objects
         self.excluded = Grid()
         self.slope = Grid()
@@ -601,11 +690,20 @@ class IGridInfo:
     def get_road_grid(self, idx):
         return self.road[idx].gridData
 
-    def get_road_grid_by_year(self, year):
+    def get_road_idx_by_year(self, year):
         for i in range(len(self.road) - 1, 0):
             if year >= self.road[i].year:
-                return self.road[i].gridData
-        return self.road[0].gridData
+                return i
+        return 0
+
+    def get_road_grid_by_year(self, year):
+        return self.road[self.get_road_idx_by_year(year)].gridData
+
+    def get_road_search_by_year(self, year):
+        return self.road_search[self.get_road_idx_by_year(year)]
+
+    def get_road_network_by_year(self, year):
+        return self.road_network[self.get_road_idx_by_year(year)]
 
     def get_road_year(self, index):
         return self.road[index].year
@@ -1,4 +1,5 @@
 from PIL import Image, ImageDraw
+import numpy as np
 from scenario import Scenario
 from logger import Logger
 from timer import TimerUtility
@@ -18,57 +19,62 @@ class ImageIO:
             Logger.log(f"\t colortable name: {colortable.name}")
             Logger.log(f"\t colortable reference: {colortable} rows: {len(colortable.color)} cols: {ncols}")
 
-        # open output gif file
-        file = open(fname, 'w')
-        # file = open(fname + "_PY", 'w')
+        # one row per color, each row filled with its own palette index
         sx = ncols  # IGrid.igrid.slope.ncols
         sy = len(colortable.color)
-        im = Image.new('RGB', (sx, sy))
-        for i in range(sy):
-            color = colortable.color[i]
-            # color_string = " ".join(map(str,color))
-            # file.write(color_string + "\n")
-            for j in range(sx):
-                im.putpixel((j, i), color)
+        key = np.repeat(np.arange(sy, dtype=np.uint8)[:, None], sx, axis=1)
+        im = ImageIO.__palette_image(key, colortable)
 
         im.save(fname)
         im.close()
-        file.close()
+
+    @staticmethod
+    def __palette_image(data, colortable):
+        # indexed image with the colortable attached as its palette
+        im = Image.fromarray(data)
+        palette = [component for color in colortable.color[:256] for component in color]
+        im.putpalette(palette + [0] * (768 - len(palette)))
+        return im
+
+    @staticmethod
+    def __palette_index(colortable, rgb):
+        # palette entry used to draw a color, the closest one if the table does not hold it
+        colors = np.array(colortable.color[:256], dtype=np.int64)
+        return int(((colors - np.array(rgb)) ** 2).sum(axis=1).argmin())
 
     @staticmethod
     def read_gif(grid, filename, grid_nrows, grid_ncols):
         TimerUtility.start_timer('gdif_ReadGIF')
-        im = Image.open(filename).convert('RGB')
+        im = Image.open(filename)
         ncols, nrows = im.size
         # print(f"{ncols} {nrows}  == {grid_ncols} {grid_nrows}")
         if ncols != grid_ncols or nrows != grid_nrows:
             print(f"{filename}: {ncols} x {nrows} image does not match expected size {grid_ncols}x{nrows}")
             raise Exception
-        max_pixel = -1
-        min_pixel = 300
-
-        test_file = open(f"{Scenario.get_scen_value('output_dir')}ReadingRoad", "w")
-
-        for j in range(grid_ncols):
-            for i in range(grid_nrows):
-                red, green, blue = im.getpixel((j, i))
-                # red, green, blue = Gdif.__hex_to_rgb(pixel_val)
-                # Check that the image is a true grayscale image
-                if red == green and red == blue:
-                    index = i * grid_ncols + j
-                    grid.gridData[index] = red
-                    test_file.write(f"{red}\n")
-                    if red > max_pixel:
-                        max_pixel = red
-                    if red < min_pixel:
-                        min_pixel = red
-                else:
-                    print(f'File is not a true gray scale image -> {red} {green} {blue}')
-
-        test_file.close()
+
+        # decode the whole image at once, grayscale images are their own gray level
+        if im.mode == 'L':
+            red = np.asarray(im).ravel()
+            gray = np.ones(len(red), dtype=bool)
+        else:
+            rgb = np.asarray(im.convert('RGB')).reshape(-1, 3)
+            red, green, blue = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+            # Check that the image is a true grayscale image
+            gray = (red == green) & (red == blue)
         im.close()
-        grid.max = max_pixel
-        grid.min = min_pixel
+
+        if not gray.all():
+            bad = np.flatnonzero(~gray)
+            print(f'File is not a true gray scale image -> {len(bad)} pixels, first at '
+                  f'{rgb[bad[0]].tolist()}')
+
+        grid.gridData[gray] = red[gray]
+        if gray.any():
+            grid.max = int(red[gray].max())
+            grid.min = int(red[gray].min())
+        else:
+            grid.max = -1
+            grid.min = 300
         TimerUtility.stop_timer('gdif_ReadGIF')
 
     @staticmethod
@@ -83,30 +89,22 @@ class ImageIO:
 
         ImageIO._date_y = grid_nrows - 16
 
-        file = open(fname, 'w')
-
-        im = Image.new('RGB', (grid_ncols, grid_nrows))
-
-        index = 0
-        for i in range(grid_nrows):
-            for j in range(grid_ncols):
-                offset = i * grid_ncols + j
-                color_component = grid.gridData[offset]
-                color_component = int(color_component)
-
-                color = colortable.color[color_component]
-                im.putpixel((j, i), color)
-                index += 1
+        # grid values are the palette indices, fractional values are truncated like int()
+        data = np.asarray(grid.gridData)[:grid_nrows * grid_ncols].astype(np.uint8).reshape(grid_nrows, grid_ncols)
+        im = ImageIO.__palette_image(data, colortable)
 
         if date is not None:
             d = ImageDraw.Draw(im)
             hex_color = date_color[2:]
             (r, g, b) = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            d.text((ImageIO._date_x, ImageIO._date_y), date, fill=(r, g, b))
+            d.text((ImageIO._date_x, ImageIO._date_y), date, fill=ImageIO.__palette_index(colortable, (r, g, b)))
 
-        im.save(fname)
+        if fname.endswith(".gif"):
+            im.save(fname)
+        else:
+            # tiffs stay rgb
+            im.convert('RGB').save(fname)
         im.close()
-        file.close()
         TimerUtility.stop_timer('gdif_WriteGIF')
 
     @staticmethod
@@ -1,13 +1,5 @@
 class Input:
 
-    @staticmethod
-    def read_file_to_grid(filename, grid):
-        grid.clear_gridData()
-        with open(filename, "r") as f:
-            line_data = f.readline()
-            for data in line_data.split():
-                grid.gridData.append(float(data))
-
     @staticmethod
     def copy_metadata(filename):
         metadata = []
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import shutil
+import numpy as np
+
+
+class InputCache:
+    # bump when the layout of a cache entry changes
+    VERSION = 2
+
+    @staticmethod
+    def get_key(grids, settings):
+        """
+        Hash of the cache version, the scenario settings the prepared and validated inputs depend on,
+        and the name, year and content of every input file, in load order
+        """
+        key = hashlib.sha256(f"pysleuth input cache {InputCache.VERSION}\n".encode())
+        for setting in settings:
+            key.update(f"{setting}\n".encode())
+        for grid in grids:
+            key.update(f"{os.path.basename(grid.filename)} {grid.year}\n".encode())
+            with open(grid.filename, "rb") as file:
+                for chunk in iter(lambda: file.read(1 << 20), b""):
+                    key.update(chunk)
+        return key.hexdigest()
+
+    @staticmethod
+    def get_path(cache_dir, key):
+        return os.path.join(cache_dir, key)
+
+    @staticmethod
+    def load(path, shared=False):
+        """
+        Returns the arrays of a cache entry as a dict, or None if there is no entry at path.
+        With shared set the grids are mapped read-only instead of read, so every process on a node
+        that maps the same entry uses one copy of them from the page cache.
+        """
+        mmap_mode = "r" if shared else None
+        info_path = os.path.join(path, "info.npz")
+        if not os.path.isfile(info_path):
+            return None
+
+        with np.load(info_path) as info:
+            entry = {name: info[name] for name in info.files}
+        for i in range(len(entry["histograms"])):
+            entry[f"grid_{i}"] = np.load(os.path.join(path, f"grid_{i}.npy"), mmap_mode=mmap_mode)
+        for i in range(int(entry["num_roads"])):
+            entry[f"road_{i}"] = np.load(os.path.join(path, f"road_{i}.npy"), mmap_mode=mmap_mode)
+        return entry
+
+    @staticmethod
+    def save(path, grids, decoded, roads, road_pixel_count, percent_road, excld_count, validation_log):
+        """
+        Writes a cache entry: the decoded grid data, the normalized roads, the grid statistics and the
+        log of the validation they passed.
+        The entry is built in a scratch directory and renamed into place, so runs sharing the cache
+        never see a partial entry.
+        """
+        if os.path.isdir(path):
+            return
+
+        scratch = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(scratch, exist_ok=True)
+        for i, data in enumerate(decoded):
+            np.save(os.path.join(scratch, f"grid_{i}.npy"), data)
+        for i, road in enumerate(roads):
+            np.save(os.path.join(scratch, f"road_{i}.npy"), road)
+        np.savez(os.path.join(scratch, "info.npz"),
+                 histograms=np.array([grid.histogram for grid in grids]),
+                 min_max=np.array([[grid.min, grid.max] for grid in grids]),
+                 num_roads=np.array(len(roads)),
+                 road_pixel_count=np.array(road_pixel_count),
+                 percent_road=np.array(percent_road),
+                 excld_count=np.array(excld_count),
+                 validation_log=np.array(validation_log))
+
+        try:
+            os.rename(scratch, path)
+        except OSError:
+            # another run stored the same entry first
+            shutil.rmtree(scratch, ignore_errors=True)
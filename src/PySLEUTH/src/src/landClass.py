@@ -1,9 +1,8 @@
 import sys
-import os
 from copy import copy
 from scenario import Scenario
-from globals import Globals
 from logger import Logger
+import numpy as np
 
 
 class LandClass:
@@ -14,8 +13,7 @@ class LandClass:
     filename = ""
     max_landclass_num = -1
     num_reduced_classes = -1
-    annual_prob_filename = ""
-    annual_prob = []
+    annual_prob = None  # land class x pixel monte carlo counts
     ugm_read = False
 
     @staticmethod
@@ -84,77 +82,38 @@ class LandClass:
 
     @staticmethod
     def init_annual_prob(total_pixels):
-        LandClass.annual_prob_filename = f"{Scenario.get_scen_value('output_dir')}annual_class_probabilities_{Globals.mype}"
-        annual_prob_file = open(LandClass.annual_prob_filename, "w")
-        num_pixels = total_pixels * LandClass.get_num_landclasses()
-
-        for i in range(LandClass.get_num_landclasses()):
-            temp = [0] * total_pixels
-            LandClass.annual_prob.append(copy(temp))
-
-        for i in range(num_pixels):
-            annual_prob_file.write(str(0))
-
-        if Scenario.get_scen_value("logging") and Scenario.get_scen_value("log_writes"):
-            Logger.log(f"{num_pixels} zeroes written to {LandClass.annual_prob_filename}")
-
-        annual_prob_file.close()
+        # count of the monte carlos that ended in each class, one row per land class
+        num_monte = int(Scenario.get_scen_value("monte_carlo_iterations"))
+        dtype = np.uint16 if num_monte <= np.iinfo(np.uint16).max else np.uint32
+        LandClass.annual_prob = np.zeros((LandClass.get_num_landclasses(), total_pixels), dtype=dtype)
 
     @staticmethod
     def update_annual_prob(land1, total_pixels):
         if len(Scenario.get_scen_value("landuse_data_file")) < 1:
             return
 
-        if Scenario.get_scen_value("logging") and Scenario.get_scen_value("log_writes"):
-            Logger.log(f"Updating file {LandClass.annual_prob_filename}")
-
-        for i in range(LandClass.get_num_landclasses()):
-            cur_annual_prob = LandClass.annual_prob[i]
-
-            for j in range(total_pixels):
-                if i == LandClass.new_indices[land1[j]]:
-                    cur_annual_prob[j] += 1
-
-    @staticmethod
-    def update_annual_prob_file():
-        annual_prob_file = open(LandClass.annual_prob_filename, "w")
-        for landclass in LandClass.annual_prob:
-            for pix in landclass:
-                annual_prob_file.write(str(pix))
-
-        annual_prob_file.close()
+        # one increment per pixel, in the row of the class it falls into
+        class_idx = np.asarray(LandClass.new_indices)[land1[:total_pixels]]
+        pixels = np.flatnonzero(class_idx < LandClass.get_num_landclasses())
+        LandClass.annual_prob[class_idx[pixels], pixels] += 1
 
     @staticmethod
     def build_prob_image(total_pixels):
-        num_landclasses = len(LandClass.landuse_classes)
-        cum_prob = [0] * total_pixels
-        cum_uncert = [0] * total_pixels
-
-        # K=0 Landclass data
-        max_grid = copy(LandClass.annual_prob[0])
-
-        # Initialize sum_grid
-        sum_grid = copy(max_grid)
-        for i in range(1, num_landclasses):
-            # Look for the max of the max and the sum
-            input_grid = copy(LandClass.annual_prob[i])
-            for j in range(total_pixels):
-                if input_grid[j] > max_grid[j]:
-                    max_grid[j] = input_grid[j]
-                    cum_prob[j] = i
-                sum_grid[j] += input_grid[j]
-
-        os.remove(LandClass.annual_prob_filename)
-
-        for i in range(total_pixels):
-            if sum_grid[i] != 0:
-                cum_uncert[i] = 100 - (100 * max_grid[i]) / sum_grid[i]
-            else:
-                msg = f"Divide by zero: sum_grid[{i}] = {sum_grid[i]}"
-                Logger.log(msg)
-                print(msg)
-                sys.exit(1)
+        annual_prob = LandClass.annual_prob[:, :total_pixels]
+
+        # the first class with the highest count wins
+        cum_prob = np.argmax(annual_prob, axis=0)
+        max_grid = np.max(annual_prob, axis=0).astype(np.int64)
+        sum_grid = np.sum(annual_prob, axis=0, dtype=np.int64)
+
+        zero_sum = np.flatnonzero(sum_grid == 0)
+        if len(zero_sum) > 0:
+            msg = f"Divide by zero: sum_grid[{zero_sum[0]}] = 0"
+            Logger.log(msg)
+            print(msg)
+            sys.exit(1)
 
+        cum_uncert = 100 - (100 * max_grid) / sum_grid
         return cum_prob, cum_uncert
 
 
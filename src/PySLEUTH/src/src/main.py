@@ -29,6 +29,12 @@ def main():
     restart_run = 0
 
     # Parse command line
+    if len(sys.argv) == 5 and sys.argv[3] == "--workers":
+        if not sys.argv[4].isdigit() or int(sys.argv[4]) < 1:
+            __print_usage(sys.argv[0])
+            sys.exit(1)
+        Globals.workers = int(sys.argv[4])
+        sys.argv = sys.argv[:3]
 
     if len(sys.argv) != 3:
         __print_usage(sys.argv[0])
@@ -120,11 +126,17 @@ def main():
         # Normalize Roads
         IGrid.normalize_roads()
 
+        # Cache the prepared inputs for the next run
+        IGrid.save_input_cache()
+
+        # Index Roads
+        IGrid.index_roads()
+
         landuse_flag = len(Scenario.get_scen_value("landuse_data_file")) != 0
         IGrid.verify_inputs(log_it, landuse_flag)
 
         # Initialize PGRID Grids
-        PGrid.init(IGrid.get_total_pixels())
+        PGrid.init(IGrid.nrows, IGrid.ncols)
 
         if log_it and Scenario.get_scen_value("log_colortables"):
             Color.log_colors()
@@ -189,6 +201,7 @@ def main():
             Processing.set_stop_year(IGrid.igrid.get_urban_year(IGrid.igrid.get_num_urban() - 1))
 
             output_dir = Scenario.get_scen_value('output_dir')
+            coeff_runs = []
             d_start, d_step, d_stop = Coeff.get_start_step_stop_diffusion()
             for diffusion_coeff in range(d_start, d_stop + 1, d_step):
                 b_start, b_step, b_stop = Coeff.get_start_step_stop_breed()
@@ -199,26 +212,34 @@ def main():
                         for slope_resist_coeff in range(sr_start, sr_stop + 1, sr_step):
                             rg_start, rg_step, rg_stop = Coeff.get_start_step_stop_road_gravity()
                             for road_grav_coeff in range(rg_start, rg_stop + 1, rg_step):
-                                filename = f"{output_dir}{UGMDefines.RESTART_FILE}{Globals.mype}"
-                                Output.write_restart_data(filename, diffusion_coeff, breed_coeff, spread_coeff, slope_resist_coeff,
-                                                          road_grav_coeff, Scenario.get_scen_value('random_seed'), restart_run)
-
-                                restart_run += 1
-                                Coeff.set_current_coeff(diffusion_coeff, spread_coeff, breed_coeff, slope_resist_coeff, road_grav_coeff)
-                                Driver.driver()
-                                Processing.increment_num_runs_exec_this_cpu()
-                                # Timing Logs
-                                if log_it and int(Scenario.get_scen_value('log_timings')) > 1:
-                                    TimerUtility.log_timers()
-
-                                Processing.increment_current_run()
-
-                                if Processing.get_processing_type() == Globals.mode_enum['test']:
-                                    TimerUtility.stop_timer('total_time')
-                                    if log_it and int(Scenario.get_scen_value('log_timings')) > 0:
-                                        TimerUtility.log_timers()
-                                    Logger.close()
-                                    sys.exit(0)
+                                coeff_runs.append((diffusion_coeff, breed_coeff, spread_coeff, slope_resist_coeff,
+                                                   road_grav_coeff))
+
+            if Processing.get_processing_type() == Globals.mode_enum['calibrate'] and Globals.workers > 1:
+                Driver.parallel_calibrate(coeff_runs, restart_run)
+
+            else:
+                for diffusion_coeff, breed_coeff, spread_coeff, slope_resist_coeff, road_grav_coeff in coeff_runs:
+                    filename = f"{output_dir}{UGMDefines.RESTART_FILE}{Globals.mype}"
+                    Output.write_restart_data(filename, diffusion_coeff, breed_coeff, spread_coeff, slope_resist_coeff,
+                                              road_grav_coeff, Scenario.get_scen_value('random_seed'), restart_run)
+
+                    restart_run += 1
+                    Coeff.set_current_coeff(diffusion_coeff, spread_coeff, breed_coeff, slope_resist_coeff, road_grav_coeff)
+                    Driver.driver()
+                    Processing.increment_num_runs_exec_this_cpu()
+                    # Timing Logs
+                    if log_it and int(Scenario.get_scen_value('log_timings')) > 1:
+                        TimerUtility.log_timers()
+
+                    Processing.increment_current_run()
+
+                    if Processing.get_processing_type() == Globals.mode_enum['test']:
+                        TimerUtility.stop_timer('total_time')
+                        if log_it and int(Scenario.get_scen_value('log_timings')) > 0:
+                            TimerUtility.log_timers()
+                        Logger.close()
+                        sys.exit(0)
 
         # Stop timer
         TimerUtility.stop_timer('total_time')
@@ -248,12 +269,13 @@ def main():
 
 def __print_usage(binary):
     print("Usage: \n")
-    print(f"{binary} <mode> <scenario file>\n")
+    print(f"{binary} <mode> <scenario file> [--workers N]\n")
     print("Allowable modes are:\n")
     print("  calibrate\n")
     print("  restart\n")
     print("  test\n")
     print("  predict\n")
+    print("--workers N runs the monte carlo iterations, or the calibration runs, on N local processes\n")
 
 
 if __name__ == '__main__':
@@ -13,13 +13,6 @@ class Output:
         restart_file.write(f"{diffusion_coeff} {breed_coeff} {spread_coeff} {slope_resist_coeff} {road_grav_coeff} {count} {counter}")
         restart_file.close()
 
-    @staticmethod
-    def write_grid_to_file(filename, grid):
-        file = open(filename, "w")
-        for data in grid.gridData:
-            file.write(f"{data} ")
-        file.close()
-
     @staticmethod
     def write_list_to_file(filename, metalist):
         file = open(filename, "w")
@@ -0,0 +1,47 @@
+import os
+
+
+class OutputSink:
+    """
+    Buffered writer for the text logs that grow line by line (coeff.log, avg.log, std_dev.log and
+    control_stats.log). Lines are held in memory and the files stay open; everything pending is written
+    and synced to disk only at run boundaries. The lines of a run cut short by an error are never
+    written, so the logs hold whole runs only, which is where the restart file resumes.
+    """
+    files = {}  # filename -> file open for appending
+    pending = {}  # filename -> lines not written yet
+
+    @staticmethod
+    def create(filename, header, overwrite=True):
+        # start a file with its header, dropping an open handle to an earlier file of that name
+        OutputSink.close(filename)
+        with open(filename, "w" if overwrite else "a") as file:
+            file.write(header)
+
+    @staticmethod
+    def write(filename, text):
+        OutputSink.pending.setdefault(filename, []).append(text)
+
+    @staticmethod
+    def write_lines(filename, lines):
+        OutputSink.pending.setdefault(filename, []).extend(lines)
+
+    @staticmethod
+    def flush():
+        for filename, lines in OutputSink.pending.items():
+            if len(lines) == 0:
+                continue
+            if filename not in OutputSink.files:
+                OutputSink.files[filename] = open(filename, "a")
+            file = OutputSink.files[filename]
+            file.write("".join(lines))
+            file.flush()
+            os.fsync(file.fileno())
+        OutputSink.pending = {}
+
+    @staticmethod
+    def close(filename):
+        OutputSink.flush()
+        file = OutputSink.files.pop(filename, None)
+        if file is not None:
+            file.close()
@@ -1,3 +1,4 @@
+import numpy as np
 from grid import Grid
 
 
@@ -11,24 +12,34 @@ class PGrid:
     count = 6
 
     @staticmethod
-    def init(num_pixels):
-        PGrid.z = Grid()
+    def init(nrows, ncols):
+        num_pixels = nrows * ncols
+
+        PGrid.z = PGrid.__new_grid(nrows, ncols)
         PGrid.z.init_grid_data(num_pixels)
 
-        PGrid.deltatron = Grid()
+        PGrid.deltatron = PGrid.__new_grid(nrows, ncols)
         PGrid.deltatron.init_grid_data(num_pixels)
 
-        PGrid.delta = Grid()
+        PGrid.delta = PGrid.__new_grid(nrows, ncols)
         PGrid.delta.init_grid_data(num_pixels)
 
-        PGrid.land1 = Grid()
+        PGrid.land1 = PGrid.__new_grid(nrows, ncols)
         PGrid.land1.init_grid_data(num_pixels)
 
-        PGrid.land2 = Grid()
+        PGrid.land2 = PGrid.__new_grid(nrows, ncols)
         PGrid.land2.init_grid_data(num_pixels)
 
-        PGrid.cumulate = Grid()
-        PGrid.cumulate.init_grid_data(num_pixels)
+        # cumulate counts urban hits over the monte carlo runs and is then normalized to a percent
+        PGrid.cumulate = PGrid.__new_grid(nrows, ncols)
+        PGrid.cumulate.init_grid_data(num_pixels, np.float64)
+
+    @staticmethod
+    def __new_grid(nrows, ncols):
+        grid = Grid()
+        grid.nrows = nrows
+        grid.ncols = ncols
+        return grid
 
     @staticmethod
     def get_z():
@@ -53,4 +64,3 @@ class PGrid:
     @staticmethod
     def get_cumulate():
         return PGrid.cumulate
-
@@ -1,23 +1,143 @@
-import random
+import numpy as np
+from processing import Processing
+
+
+class RandomBuffer:
+    # uniforms generated by the first refill of a stream, each later refill doubles up to BLOCK_SIZE
+    MIN_BLOCK_SIZE = 256
+    BLOCK_SIZE = 65536
+
+    def __init__(self, seed=None):
+        # Philox is counter based, so every keyed stream is independent of the others
+        self.bit_generator = np.random.Philox(seed)
+        self.generator = np.random.Generator(self.bit_generator)
+        self.block = np.zeros(0, dtype=np.float64)
+        self.values = None  # block as python floats, made when float first reads it
+        self.pos = 0
+        self.block_size = RandomBuffer.MIN_BLOCK_SIZE
+
+    def set_key(self, seed_seq):
+        """
+        Restarts the reused bit generator on the stream Philox(seed_seq) would give, which is cheaper than
+        building a new generator every time a phase switches streams
+        """
+        self.bit_generator.state = {
+            'bit_generator': 'Philox',
+            'state': {'counter': np.zeros(4, dtype=np.uint64), 'key': seed_seq.generate_state(2, np.uint64)},
+            'buffer': np.zeros(4, dtype=np.uint64),
+            'buffer_pos': 4,
+            'has_uint32': 0,
+            'uinteger': 0,
+        }
+        self.block = np.zeros(0, dtype=np.float64)
+        self.values = None
+        self.pos = 0
+        self.block_size = RandomBuffer.MIN_BLOCK_SIZE
+
+    def __refill(self):
+        # the stream is the same whatever the block sizes, so small blocks only save work
+        self.block = self.generator.random(self.block_size)
+        self.values = None
+        self.pos = 0
+        self.block_size = min(2 * self.block_size, RandomBuffer.BLOCK_SIZE)
+
+    def float(self):
+        if self.pos >= len(self.block):
+            self.__refill()
+        if self.values is None:
+            self.values = self.block.tolist()
+        value = self.values[self.pos]
+        self.pos += 1
+        return value
+
+    def int(self, lo, hi):
+        # uniform int in [lo, hi], both ends included
+        return lo + int(self.float() * (hi - lo + 1))
+
+    def skip(self, n):
+        # drop the next n uniforms of the stream
+        while n > 0:
+            if self.pos >= len(self.block):
+                self.__refill()
+            take = min(n, len(self.block) - self.pos)
+            self.pos += take
+            n -= take
+
+    def floats(self, n):
+        # n uniforms taken from the same stream as float
+        out = np.empty(n, dtype=np.float64)
+        filled = 0
+        while filled < n:
+            if self.pos >= len(self.block):
+                self.__refill()
+            take = min(n - filled, len(self.block) - self.pos)
+            out[filled:filled + take] = self.block[self.pos:self.pos + take]
+            self.pos += take
+            filled += take
+        return out
+
+    def ints(self, n, lo, hi):
+        # n uniform ints in [lo, hi], both ends included
+        return lo + (self.floats(n) * (hi - lo + 1)).astype(np.int64)
 
 
 class Random:
+    # phases that draw from their own stream
+    SPREAD_PHASE1N3 = 1
+    SPREAD_PHASE4 = 4
+    SPREAD_PHASE5 = 5
+    DELTATRON_PHASE1 = 6
+    DELTATRON_PHASE2 = 7
+
+    seed = 0
+    buffer = RandomBuffer()
+
     @staticmethod
     def set_seed(seed):
-        random.seed(seed)
+        Random.seed = int(seed)
+        Random.buffer = RandomBuffer(Random.seed)
+
+    @staticmethod
+    def set_stream(phase):
+        """
+        Switch to the stream keyed by (seed, run, monte carlo, year, phase), so the draws of a phase
+        do not depend on which runs or monte carlo iterations were executed before it
+        """
+        key = [Random.seed, Processing.get_current_run(), Processing.get_current_monte(),
+               Processing.get_current_year(), phase]
+        Random.buffer.set_key(np.random.SeedSequence([int(k) for k in key]))
 
     @staticmethod
     def get_int(min, max):
-        return random.randint(min, max)
+        return Random.buffer.int(min, max)
+
+    @staticmethod
+    def get_ints(num, min, max):
+        # num ints in [min, max], both ends included like get_int
+        return Random.buffer.ints(num, min, max)
+
+    @staticmethod
+    def skip(num):
+        # advance the stream as if num draws were taken
+        Random.buffer.skip(num)
 
     @staticmethod
     def get_float():
-        return random.random()
+        return Random.buffer.float()
+
+    @staticmethod
+    def get_floats(num):
+        return Random.buffer.floats(num)
 
     @staticmethod
     def get_element(lst):
-        return random.choice(lst)
+        return lst[Random.buffer.int(0, len(lst) - 1)]
 
     @staticmethod
     def get_unique_elements(lst, num):
-        return random.sample(lst, num)
+        # partial Fisher-Yates shuffle, the first num entries are the sample
+        pool = list(lst)
+        for k in range(num):
+            swap = Random.buffer.int(k, len(pool) - 1)
+            pool[k], pool[swap] = pool[swap], pool[k]
+        return pool[:num]
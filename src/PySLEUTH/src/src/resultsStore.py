@@ -0,0 +1,48 @@
+import sqlite3
+
+
+class ResultsStore:
+    """
+    SQLite copy of the control stats, one row per run with its scores, coefficients, monte carlo count
+    and run time. Rows are keyed by the coefficients, which every piece of a split calibration sweeps
+    over its own range, so the databases of the pieces merge without collisions even though each
+    piece numbers its runs from 0. Indexed on the product score so runs can be ranked with queries.
+    """
+    # score columns, in control_stats.log order
+    METRICS = ("product", "compare", "pop", "edges", "clusters", "cluster_size", "leesalee", "slope",
+               "percent_urban", "x_mean", "y_mean", "radius", "fmatch")
+    COEFFICIENTS = ("diffusion", "breed", "spread", "slope_resistance", "road_gravity")
+    COLUMNS = ("run",) + METRICS + COEFFICIENTS + ("monte_carlo_iterations", "run_time_ms")
+
+    connections = {}  # filename -> open connection
+    captured_rows = None  # (filename, row) list when a calibration worker defers its rows
+
+    @staticmethod
+    def get_connection(filename):
+        if filename not in ResultsStore.connections:
+            # every process of a job may add to the same file, wait for the others' writes
+            connection = sqlite3.connect(filename, timeout=60)
+            columns = ["run INTEGER"] + [f"{name} REAL" for name in ResultsStore.METRICS] + \
+                      [f"{name} INTEGER" for name in ResultsStore.COEFFICIENTS] + \
+                      ["monte_carlo_iterations INTEGER", "run_time_ms REAL",
+                       f"PRIMARY KEY ({', '.join(ResultsStore.COEFFICIENTS)})"]
+            with connection:
+                connection.execute(f"CREATE TABLE IF NOT EXISTS runs ({', '.join(columns)})")
+                connection.execute("CREATE INDEX IF NOT EXISTS runs_product ON runs (product)")
+            ResultsStore.connections[filename] = connection
+        return ResultsStore.connections[filename]
+
+    @staticmethod
+    def add_run(filename, row):
+        """
+        Stores the row of a run, a tuple in COLUMNS order. A restarted run replaces its earlier row, as it
+        has the same coefficients.
+        """
+        if ResultsStore.captured_rows is not None:
+            ResultsStore.captured_rows.append((filename, row))
+            return
+
+        connection = ResultsStore.get_connection(filename)
+        with connection:
+            connection.execute(f"INSERT OR REPLACE INTO runs ({', '.join(ResultsStore.COLUMNS)}) "
+                               f"VALUES ({', '.join('?' * len(ResultsStore.COLUMNS))})", row)
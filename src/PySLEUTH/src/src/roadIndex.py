@@ -0,0 +1,205 @@
+import numpy as np
+from ugm_defines import UGMDefines
+from rand import Random
+
+
+class RoadSearchIndex:
+    # spiral search offsets shared by every index, (i, j) for each search index in spiral order
+    spiral_i = np.zeros(0, dtype=np.int32)
+    spiral_j = np.zeros(0, dtype=np.int32)
+
+    def __init__(self, roads, nrows, ncols):
+        self.roads = roads
+        self.nrows = nrows
+        self.ncols = ncols
+
+        # Road gravity val's maximum (if rg_coeff == 100) will be 1/16 of the Image dimensions
+        max_road_gravity_val = int((nrows + ncols) / 16)
+        self.max_search_index = max(4 * max_road_gravity_val * (1 + max_road_gravity_val), nrows, ncols)
+        self.max_band = RoadSearchIndex.band_of(self.max_search_index - 1)
+        RoadSearchIndex.extend_spiral(self.max_search_index)
+
+        self.band = self.__nearest_road_band()
+
+    @staticmethod
+    def band_of(index):
+        # band bn holds the search indices [4 * (bn - 1) * bn, 4 * bn * (bn + 1))
+        bn = 1
+        while 4 * bn * (bn + 1) <= index:
+            bn += 1
+        return bn
+
+    @staticmethod
+    def extend_spiral(num_indices):
+        if len(RoadSearchIndex.spiral_i) >= num_indices:
+            return
+
+        i_offsets = []
+        j_offsets = []
+        for bn in range(1, RoadSearchIndex.band_of(num_indices - 1) + 1):
+            # left side top to bottom, bottom left to right, right side bottom to top, top right to left
+            side = np.arange(-bn, bn + 1)
+            inner = np.arange(-bn + 1, bn)
+            i_offsets += [side, np.full(len(inner), bn), side[::-1], np.full(len(inner), -bn)]
+            j_offsets += [np.full(len(side), -bn), inner, np.full(len(side), bn), inner[::-1]]
+
+        RoadSearchIndex.spiral_i = np.concatenate(i_offsets).astype(np.int32)
+        RoadSearchIndex.spiral_j = np.concatenate(j_offsets).astype(np.int32)
+
+    def __nearest_road_band(self):
+        """
+        For each pixel, the spiral band holding the closest road pixel (chebyshev distance) other than
+        the pixel itself. Road pixels with no road neighbor get -1 and are searched the slow way,
+        pixels with no road within max_band get max_band + 1.
+        """
+        road = self.roads.reshape(self.nrows, self.ncols) != 0
+        band = np.full((self.nrows, self.ncols), self.max_band + 1, dtype=np.int32)
+
+        reach = road.copy()
+        unresolved = ~road
+        for bn in range(1, self.max_band + 1):
+            reach = RoadSearchIndex.__dilate(reach)
+            if bn == 1:
+                # road pixels with a road neighbor find it in the first band
+                band[road] = -1
+                band[road & RoadSearchIndex.__has_road_neighbor(road)] = 1
+            found = unresolved & reach
+            band[found] = bn
+            unresolved &= ~found
+            if not unresolved.any():
+                break
+
+        return band.ravel()
+
+    @staticmethod
+    def __dilate(mask):
+        # grow a mask by one pixel in all 8 directions
+        rows = mask.copy()
+        rows[1:, :] |= mask[:-1, :]
+        rows[:-1, :] |= mask[1:, :]
+        out = rows.copy()
+        out[:, 1:] |= rows[:, :-1]
+        out[:, :-1] |= rows[:, 1:]
+        return out
+
+    @staticmethod
+    def __has_road_neighbor(road):
+        padded = np.pad(road, 1)
+        nrows, ncols = road.shape
+        count = np.zeros(road.shape, dtype=np.uint8)
+        for i in range(3):
+            for j in range(3):
+                if i != 1 or j != 1:
+                    count += padded[i:i + nrows, j:j + ncols]
+        return count > 0
+
+    def search(self, i_grwth_center, j_grwth_center, max_search_index):
+        """
+        Returns (road_found, i_road, j_road), the first road pixel in spiral order around the
+        growth center that lies within the first max_search_index search positions.
+        """
+        band = int(self.band[i_grwth_center * self.ncols + j_grwth_center])
+        if band < 0:
+            start = 0
+            stop = max_search_index
+        elif band > self.max_band:
+            start = 4 * self.max_band * (self.max_band + 1)
+            stop = max_search_index
+        else:
+            start = 4 * (band - 1) * band
+            stop = min(max_search_index, 4 * band * (band + 1))
+
+        if stop > start:
+            RoadSearchIndex.extend_spiral(stop)
+            i = i_grwth_center + RoadSearchIndex.spiral_i[start:stop]
+            j = j_grwth_center + RoadSearchIndex.spiral_j[start:stop]
+            in_bounds = np.flatnonzero((0 <= i) & (i < self.nrows) & (0 <= j) & (j < self.ncols))
+            hits = in_bounds[self.roads[i[in_bounds] * self.ncols + j[in_bounds]] != 0]
+            if len(hits) > 0:
+                return True, int(i[hits[0]]), int(j[hits[0]])
+
+        return False, 0, 0
+
+
+class RoadNetwork:
+    # neighbor directions in the order road_walk tries them
+    neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0)]
+
+    # for a bitmask of road neighbors and a random starting direction, the first road direction
+    # found by trying the directions in order (-1 if none), and the rank of a direction among the set bits
+    first_dir = []
+    rank = []
+
+    @staticmethod
+    def build_direction_tables():
+        RoadNetwork.first_dir = [[-1] * 8 for mask in range(256)]
+        RoadNetwork.rank = [[0] * 8 for mask in range(256)]
+        for mask in range(256):
+            for idx in range(8):
+                for k in range(8):
+                    if mask & (1 << ((idx + k) % 8)):
+                        RoadNetwork.first_dir[mask][idx] = (idx + k) % 8
+                        break
+                RoadNetwork.rank[mask][idx] = bin(mask & ((1 << idx) - 1)).count("1")
+
+    def __init__(self, roads, nrows, ncols):
+        """
+        Compressed sparse row graph of the road pixels: node n is the n-th road pixel in raster order,
+        its road neighbors are indices[indptr[n]:indptr[n + 1]] in direction order
+        """
+        if len(RoadNetwork.first_dir) == 0:
+            RoadNetwork.build_direction_tables()
+        self.nrows = nrows
+        self.ncols = ncols
+
+        road = roads.reshape(nrows, ncols) != 0
+        padded = np.pad(road, 1)
+        masks = np.zeros((nrows, ncols), dtype=np.int32)
+        for d, (i, j) in enumerate(RoadNetwork.neighbor_options):
+            masks |= padded[1 + i:1 + i + nrows, 1 + j:1 + j + ncols].astype(np.int32) << d
+
+        pixels = np.flatnonzero(road)
+        node_of = np.full(nrows * ncols, -1, dtype=np.int32)
+        node_of[pixels] = np.arange(len(pixels), dtype=np.int32)
+        masks = masks.ravel()[pixels]
+
+        neighbor_dirs = (masks[:, None] >> np.arange(8)) & 1
+        self.indptr = np.zeros(len(pixels) + 1, dtype=np.int32)
+        self.indptr[1:] = np.cumsum(neighbor_dirs.sum(axis=1))
+        nodes, dirs = np.nonzero(neighbor_dirs)
+        offsets = np.array([i * ncols + j for i, j in RoadNetwork.neighbor_options])
+        self.indices = node_of[pixels[nodes] + offsets[dirs]]
+        self.values = roads[pixels]
+
+        self.node_of = node_of
+        self.pixels = pixels
+        self.masks = masks
+
+        # plain lists for the per step lookups in walk
+        self.__indptr = self.indptr.tolist()
+        self.__indices = self.indices.tolist()
+        self.__values = self.values.tolist()
+        self.__masks = masks.tolist()
+
+    def walk(self, i_road_start, j_road_start, diffusion_coeff):
+        """
+        Walk along the road from a road pixel, stepping to the first road neighbor from a random direction
+        until the road ends or the run exceeds the road's run value.
+        Returns (spread, i_road_end, j_road_end)
+        """
+        node = int(self.node_of[i_road_start * self.ncols + j_road_start])
+        run = 0
+        while True:
+            mask = self.__masks[node]
+            d = RoadNetwork.first_dir[mask][Random.get_int(0, 7)]
+            end_of_road = d < 0
+            if not end_of_road:
+                run += 1
+                node = self.__indices[self.__indptr[node] + RoadNetwork.rank[mask][d]]
+
+            run_value = int(self.__values[node] / UGMDefines.MAX_ROAD_VALUE * diffusion_coeff)
+            if run > run_value:
+                i_road_end, j_road_end = divmod(int(self.pixels[node]), self.ncols)
+                return True, i_road_end, j_road_end
+            if end_of_road:
+                return False, 0, 0
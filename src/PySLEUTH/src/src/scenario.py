@@ -72,7 +72,7 @@ class Scenario:
                     landuse_class_info.append(value)
                 elif key == 'deltatron_color':
                     deltatron_color.append(Scenario.__process_color(value))
-                elif key == 'input_dir' or key == 'output_dir':
+                elif key == 'input_dir' or key == 'output_dir' or key == 'input_cache_dir':
                     #we don't want to lowercase the input/output path
                     scenario_info_dict[key] = value
                 else:
@@ -123,6 +123,9 @@ class Scenario:
 
     @staticmethod
     def add_defaults(dict):
+        dict["input_cache_dir"] = ""
+        dict["input_cache_shared"] = False
+        dict["write_results_db"] = False
         dict["date_color"] = "0xffffff"
         dict["seed_color"] = "0xf9d16e"
         dict["water_color"] = "0x1434d6"
@@ -8,10 +8,14 @@ from rand import Random
 from stats import Stats
 from utilities import Utilities
 from timer import TimerUtility
-import sys
+from collections import OrderedDict
+import numpy as np
 import math
 
 class Spread:
+    SLOPE_CACHE_SIZE = 16
+    # slope resistance -> slope weight table, least recently used first
+    slope_cache = OrderedDict()
 
     @staticmethod
     def spread(z, avg_slope):
@@ -31,44 +35,43 @@ class Spread:
         spread = Coeff.get_current_spread()
 
         excld = IGrid.igrid.get_excld_grid()
-        roads = IGrid.igrid.get_road_grid_by_year(Processing.get_current_year())
+        road_index = IGrid.igrid.get_road_search_by_year(Processing.get_current_year())
+        road_network = IGrid.igrid.get_road_network_by_year(Processing.get_current_year())
         slope = IGrid.igrid.get_slope_grid()
 
         nrows = IGrid.nrows
         ncols = IGrid.ncols
 
         # Zero the growth array for this time period
-        delta = [0] * (nrows * ncols)
+        delta = np.zeros(nrows * ncols, dtype=np.uint8)
 
         # Get slope rates
         slope_weights = Spread.get_slope_weights()
 
         # Phase 1N3 - Spontaneous Neighborhood Growth and Spreading
+        Random.set_stream(Random.SPREAD_PHASE1N3)
         sng, sdc = Spread.phase1n3(diffusion, breed, z.gridData, delta, slope, excld, slope_weights, sng, sdc)
 
         # Phase 4 - Organic Growth
+        Random.set_stream(Random.SPREAD_PHASE4)
         og = Spread.phase4(spread, z.gridData, excld, delta, slope, slope_weights, og)
 
         # Phase 5 - Road Influence Growth
-        rt = Spread.phase5(road_gravity, diffusion, breed, z.gridData, delta, slope, excld, roads, slope_weights, rt)
+        Random.set_stream(Random.SPREAD_PHASE5)
+        rt = Spread.phase5(road_gravity, diffusion, breed, z.gridData, delta, slope, excld, road_index,
+                           road_network, slope_weights, rt)
 
         Utilities.condition_gt_gif(delta, UGMDefines.PHASE5G, delta, 0)
         Utilities.condition_ge_gif(excld, 100, delta, 0)
 
         # Now place growth array into current array
-        num_growth_pix = 0
-        avg_slope = 0.0
-
-        for i in range(total_pixels):
-            if z.gridData[i] == 0 and delta[i] > 0:
-                # New growth being placed into array
-                avg_slope += slope[i]
-                z.gridData[i] = delta[i]
-                num_growth_pix += 1
-        pop = 0
-        for pixels in z.gridData:
-            if pixels >= UGMDefines.PHASE0G:
-                pop += 1
+        new_growth = (z.gridData == 0) & (delta > 0)
+        num_growth_pix = int(np.count_nonzero(new_growth))
+        avg_slope = float(slope[new_growth].sum())
+        z.gridData[new_growth] = delta[new_growth]
+        Stats.add_growth(np.flatnonzero(new_growth))
+
+        pop = int(np.count_nonzero(z.gridData >= UGMDefines.PHASE0G))
 
         if num_growth_pix == 0:
             avg_slope = 0.0
@@ -80,31 +83,49 @@ class Spread:
 
     @staticmethod
     def get_slope_weights():
-        slope_weight_array_size = 256
-        slope_weights = []
-
-        exp = Coeff.get_current_slope_resistance() / (UGMDefines.MAX_SLOPE_RESISTANCE_VALUE / 2)
-        critical_slope = int(float(Scenario.get_scen_value('critical_slope')))
-        for i in range(critical_slope):
-            val = (critical_slope - 1 / critical_slope)
-            slope_weights.append(1.0 - math.pow(val, exp))
-
-        for i in range(critical_slope, slope_weight_array_size):
-            slope_weights.append(1.0)
+        """
+        Slope weight of every slope value for the current slope resistance, the threshold a random float
+        has to beat for a pixel to pass the slope test. Tables of recent slope resistances are kept in a
+        small least recently used cache.
+        """
+        slope_resist = Coeff.get_current_slope_resistance()
+        if slope_resist in Spread.slope_cache:
+            Spread.slope_cache.move_to_end(slope_resist)
+            slope_weights = Spread.slope_cache[slope_resist]
+        else:
+            slope_weights = Spread.build_slope_weights(slope_resist)
+            Spread.slope_cache[slope_resist] = slope_weights
+            if len(Spread.slope_cache) > Spread.SLOPE_CACHE_SIZE:
+                Spread.slope_cache.popitem(last=False)
 
         if Scenario.get_scen_value('logging') and Scenario.get_scen_value('log_slope_weights'):
-            Logger.log("***** LOG OF SLOPE WEIGHTS *****")
-            Logger.log(f"Critical Slope =  {critical_slope}")
-            Logger.log(f"Current Slope Resist = {Coeff.get_current_slope_resistance()}")
-            Logger.log(f"Max Slope Resistance value = {UGMDefines.MAX_SLOPE_RESISTANCE_VALUE}")
-            for i, weight in enumerate(slope_weights):
-                if i < critical_slope:
-                    Logger.log(f"weight[{i}] = {weight}")
+            Spread.log_slope_weights(slope_weights)
+        return slope_weights
 
-            Logger.log(f"All other values to slope weights = 1.0")
+    @staticmethod
+    def build_slope_weights(slope_resist):
+        slope_weight_array_size = 256
+        slope_weights = np.ones(slope_weight_array_size)
 
+        exp = slope_resist / (UGMDefines.MAX_SLOPE_RESISTANCE_VALUE / 2)
+        critical_slope = int(float(Scenario.get_scen_value('critical_slope')))
+        val = (critical_slope - 1 / critical_slope)
+        slope_weights[:critical_slope] = 1.0 - math.pow(val, exp)
         return slope_weights
 
+    @staticmethod
+    def log_slope_weights(slope_weights):
+        critical_slope = int(float(Scenario.get_scen_value('critical_slope')))
+        Logger.log("***** LOG OF SLOPE WEIGHTS *****")
+        Logger.log(f"Critical Slope =  {critical_slope}")
+        Logger.log(f"Current Slope Resist = {Coeff.get_current_slope_resistance()}")
+        Logger.log(f"Max Slope Resistance value = {UGMDefines.MAX_SLOPE_RESISTANCE_VALUE}")
+        for i, weight in enumerate(slope_weights.tolist()):
+            if i < critical_slope:
+                Logger.log(f"weight[{i}] = {weight}")
+
+        Logger.log(f"All other values to slope weights = 1.0")
+
     @staticmethod
     def phase1n3(diffusion_coeff, breed_coeff, z, delta, slope, excld, slope_weights, sng, sdc):
         TimerUtility.start_timer("spr_phase1n3")
@@ -141,42 +162,39 @@ class Spread:
         nrows = IGrid.nrows
         ncols = IGrid.ncols
         neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
-
-        # Loop over the interior pixels looking for urban from which to perform organic growth
-        for row in range(1, nrows - 1):
-            for col in range(1, ncols - 1):
-                offset = row * ncols + col
-
-                # Is this an urban pixel and do we pass the random spread coefficient test?
-                if z[offset] > 0 and Random.get_int(0, 100) < spread_coeff:
-
-                    # Examine the eight cell neighbors
-                    # Spread at random if at least 2 are urban
-                    # Pixel itself must be urban (3)
-                    urb_count = Spread.count_neighbor(z, row, col)
-                    if 2 <= urb_count < 8:
-                        x_neigh, y_neigh = Random.get_element(neighbor_options)
-                        row_neighbor = row + x_neigh
-                        col_neighbor = col + y_neigh
-                        success, og = Spread.urbanize(row_neighbor, col_neighbor, z, delta,
-                                                      slope, excld, slope_weights, UGMDefines.PHASE4G, og)
+        neighbor_offsets = np.array([i * ncols + j for i, j in neighbor_options])
+
+        # Examine the eight cell neighbors of every interior pixel at once
+        urban = z.reshape(nrows, ncols) > 0
+        urb_count = Spread.count_neighbors(urban)
+
+        # Interior urban pixels in row major order, do they pass the random spread coefficient test?
+        interior = np.zeros((nrows, ncols), dtype=bool)
+        interior[1:-1, 1:-1] = urban[1:-1, 1:-1]
+        candidates = np.flatnonzero(interior)
+        candidates = candidates[Random.get_ints(len(candidates), 0, 100) < spread_coeff]
+
+        # Spread at random if at least 2 are urban
+        # Pixel itself must be urban (3)
+        counts = urb_count.ravel()[candidates]
+        candidates = candidates[(2 <= counts) & (counts < 8)]
+        targets = candidates + neighbor_offsets[Random.get_ints(len(candidates), 0, len(neighbor_options) - 1)]
+        og = Spread.urbanize_all(targets, z, delta, slope, excld, slope_weights, UGMDefines.PHASE4G, og)
         TimerUtility.stop_timer('spr_phase4')
         return og
 
     @staticmethod
-    def phase5(road_gravity, diffusion_coeff, breed_coeff, z, delta, slope, excld, roads, slope_weights, rt):
+    def phase5(road_gravity, diffusion_coeff, breed_coeff, z, delta, slope, excld, road_index, road_network,
+               slope_weights, rt):
         TimerUtility.start_timer('spr_phase5')
         nrows = IGrid.nrows
         ncols = IGrid.ncols
         total_pixels = nrows * ncols
 
         # Determine the total growth count and save the row and col locations of the new growth
-        growth_tracker = []
-        growth_count = 0
-        for i in range(total_pixels):
-            if delta[i] > 0:
-                growth_tracker.append((int(i / ncols), i % ncols))
-                growth_count += 1
+        growth_rows, growth_cols = np.divmod(np.flatnonzero(delta), ncols)
+        growth_tracker = list(zip(growth_rows.tolist(), growth_cols.tolist()))
+        growth_count = len(growth_tracker)
 
         # Phase 5: Road Trips
         # If there is new growth, begin processing road trips
@@ -203,16 +221,15 @@ class Spread:
 
 
                 # Search for road about this growth point
-                road_found, i_road_start, j_road_start = Spread.road_search(growth_row, growth_col,
-                                                                            max_search_index, roads)
+                road_found, i_road_start, j_road_start = road_index.search(growth_row, growth_col,
+                                                                           max_search_index)
 
                 # If there is a road found, then walk along it
                 i_road_end = 0
                 j_road_end = 0
                 spread = False
                 if road_found:
-                    #print(roads)
-                    spread, i_road_end, j_road_end = Spread.road_walk(i_road_start, j_road_start, roads, diffusion_coeff)
+                    spread, i_road_end, j_road_end = road_network.walk(i_road_start, j_road_start, diffusion_coeff)
 
 
                 if spread:
@@ -267,6 +284,38 @@ class Spread:
 
         return flag, stat
 
+    @staticmethod
+    def urbanize_all(offsets, z, delta, slope, excld, slope_weights, pixel_val, stat):
+        """
+        Vectorized urbanize for a list of pixel offsets, tried in order. A pixel urbanized by
+        an earlier attempt counts as a delta failure for the attempts after it, as in urbanize.
+        """
+        z_fail = z[offsets] != 0
+        delta_fail = ~z_fail & (delta[offsets] != 0)
+        tries = np.flatnonzero(~z_fail & ~delta_fail)
+        try_offsets = offsets[tries]
+
+        slope_pass = Random.get_floats(len(tries)) > slope_weights[slope[try_offsets]]
+        excld_pass = excld[try_offsets] < Random.get_ints(len(tries), 0, 99)
+        success = slope_pass & excld_pass
+
+        # only the first success on each pixel takes it, later tries on that pixel find it in delta
+        won_offsets, first_won = np.unique(try_offsets[success], return_index=True)
+        won_tries = tries[np.flatnonzero(success)[first_won]]
+        taken = np.zeros(len(tries), dtype=bool)
+        if len(won_offsets) > 0:
+            won_idx = np.searchsorted(won_offsets, try_offsets).clip(max=len(won_offsets) - 1)
+            taken = (won_offsets[won_idx] == try_offsets) & (tries > won_tries[won_idx])
+
+        delta[won_offsets] = pixel_val
+        stat += len(won_offsets)
+
+        Stats.increment_z_failure(int(np.count_nonzero(z_fail)))
+        Stats.increment_delta_failure(int(np.count_nonzero(delta_fail)) + int(np.count_nonzero(taken)))
+        Stats.increment_slope_failure(int(np.count_nonzero(~slope_pass & ~taken)))
+        Stats.increment_excluded_failure(int(np.count_nonzero(slope_pass & ~excld_pass & ~taken)))
+        return stat
+
     @staticmethod
     def urbanize_neighbor(row, col, z, delta, slope, excld, slope_weights, pixel_val, stat):
         nrows = IGrid.nrows
@@ -303,38 +352,16 @@ class Spread:
         return neigh_row, neigh_col
 
     @staticmethod
-    def get_neighbor(row, col):
+    def count_neighbors(urban):
+        # urban neighbors of every interior pixel of a 2-D mask, border pixels are left at 0
+        nrows, ncols = urban.shape
         neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
-        idx = Random.get_int(0, 7)
-
-        idx_x, idx_y = neighbor_options[idx]
-        neigh_row = row + idx_x
-        neigh_col = col + idx_y
-
-        return idx, int(neigh_row), int(neigh_col)
-
-    @staticmethod
-    def get_next_neighbor(idx, row, col):
-        neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
-        idx = (idx + 1) % 8
-
-        idx_x, idx_y = neighbor_options[idx]
-        neigh_row = row + idx_x
-        neigh_col = col + idx_y
-        return idx, int(neigh_row), int(neigh_col)
-
-    @staticmethod
-    def count_neighbor(z, row, col):
-        neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
-        urb_count = 0
+        counts = np.zeros((nrows, ncols), dtype=np.uint8)
+        interior = counts[1:-1, 1:-1]
         for x, y in neighbor_options:
-            neighbor_row = row + x
-            neighbor_col = col + y
-            offset = neighbor_row * IGrid.ncols + neighbor_col
-            if z[offset] > 0:
-                urb_count += 1
+            interior += urban[1 + x:nrows - 1 + x, 1 + y:ncols - 1 + y]
 
-        return urb_count
+        return counts
 
     @staticmethod
     def get_road_gravity_val(road_gravity):
@@ -346,114 +373,6 @@ class Spread:
 
         return int ((road_gravity / UGMDefines.MAX_ROAD_VALUE) * ((nrows + ncols) / 16))
 
-    @staticmethod
-    def road_search(i_grwth_center, j_grwth_center, max_search_index, roads):
-
-        nrows = IGrid.nrows
-        ncols = IGrid.ncols
-        road_found = False
-        i_road = 0
-        j_road = 0
-        for search_idx in range(max_search_index):
-            i_offset, j_offset = Spread.spiral(search_idx)
-            i = i_grwth_center + i_offset
-            j = j_grwth_center + j_offset
-
-            if 0 <= i < nrows and 0 <= j < ncols:
-                offset = int(i * ncols + j)
-                if roads[offset] != 0:
-                    road_found = True
-                    i_road = i
-                    j_road = j
-                    break
-        return road_found, i_road, j_road
-
-    @staticmethod
-    def spiral(index):
-        nrows = IGrid.nrows
-        ncols = IGrid.ncols
-
-        bn_found = False
-        bn = 0
-        for i in range(1, max(nrows, ncols)):
-            total = 8 * ((1 + i) * i) / 2
-            if total > index:
-                bn_found = True
-                bn = i
-                break
-
-        if not bn_found:
-            Logger.log("Unable to find road search band, bn.")
-            print("Unable to find road search band, bn")
-            sys.exit(1)
-        bo = index - 8 * ((bn - 1) * bn / 2)
-        left_ln = right_ln = bn * 2 + 1
-        top_ln = bot_ln = bn * 2 - 1
-        range1 = left_ln
-        range2 = left_ln + bot_ln
-        range3 = left_ln + bot_ln + right_ln
-        range4 = left_ln + bot_ln + right_ln + top_ln
-        if bo < range1:
-            region_offset = bo % range1
-            i = -bn + region_offset
-            j = -bn
-        elif bo < range2:
-            region_offset = (bo - range1) % range2
-            i = bn
-            j = -bn + 1 + region_offset
-        elif bo < range3:
-            region_offset = (bo - range2) % range3
-            i = bn - region_offset
-            j = bn
-        elif bo < range4:
-            region_offset = (bo - range3) % range4
-            i = -bn
-            j = bn - 1 - region_offset
-        else:
-            msg = "Unable to calculate (i, j) for road search"
-            Logger.log(msg)
-            print(msg)
-            sys.exit(1)
-        return i, j
-
-    @staticmethod
-    def road_walk(i_road_start, j_road_start, roads, diffusion_coeff):
-        nrows = IGrid.nrows
-        ncols = IGrid.ncols
-        i = i_road_start
-        j = j_road_start
-        end_of_road = False
-        spread = False
-        run = 0
-        i_road_end = 0
-        j_road_end = 0
-        while not end_of_road:
-            end_of_road = True
-            #print("********************************************")
-            idx, i_neigh, j_neigh = Spread.get_neighbor(i, j)
-            #print(f"i: {i_neigh} j: {j_neigh}")
-            for k in range(8):
-                if 0 <= i_neigh < nrows and 0 <= j_neigh < ncols:
-                    offset = i_neigh * ncols + j_neigh
-                    if roads[offset] != 0:
-                        end_of_road = False
-                        run += 1
-                        i = i_neigh
-                        j = j_neigh
-                        break
-                idx, i_neigh, j_neigh = Spread.get_next_neighbor(idx, i, j)
-                #print(f"i: {i_neigh} j: {j_neigh}")
-            #print("********************************************")
-            offset = int(i * ncols + j)
-            run_value = int(roads[offset] / UGMDefines.MAX_ROAD_VALUE * diffusion_coeff)
-            #print(f"run: {run} run_value {run_value} diffusionCoeff {diffusion_coeff}")
-            if run > run_value:
-                end_of_road = True
-                spread = True
-                i_road_end = i
-                j_road_end = j
-
-        return spread, i_road_end, j_road_end
 
 
 
@@ -2,18 +2,29 @@ from igrid import IGrid
 from logger import Logger
 from processing import Processing
 from statsVal import StatsVal
+from statsAccumulator import StatsAccumulator
 from pgrid import PGrid
 from scenario import Scenario
 from globals import Globals
 from coeff import Coeff
-from ugm_defines import UGMDefines
+from clusterLabel import ClusterLabel
+from statsTracker import StatsTracker
+from resultsStore import ResultsStore
+from timer import TimerUtility
+from outputSink import OutputSink
+import numpy as np
 import sys
 import math
-import _pickle
+import operator
 import os.path
 
 
 class StatsInfo:
+    FIELDS = ("area", "edges", "clusters", "pop", "x_mean", "y_mean", "radius", "average_slope", "mean_cluster_size",
+              "percent_urban")
+    __slots__ = FIELDS
+    get_fields = operator.attrgetter(*FIELDS)
+
     def __init__(self):
         self.area = -1.0
         self.edges = -1.0
@@ -50,19 +61,14 @@ class StatsInfo:
         # fields[key] = val
 
     def get_field_by_name(self, name):
-        fields = {
-            "area": self.area,
-            "edges": self.edges,
-            "clusters": self.clusters,
-            "pop": self.pop,
-            "x_mean": self.x_mean,
-            "y_mean": self.y_mean,
-            "radius": self.radius,
-            "average_slope": self.average_slope,
-            "mean_cluster_size": self.mean_cluster_size,
-            "percent_urban": self.percent_urban
-        }
-        return fields[name]
+        return getattr(self, name)
+
+    def get_values(self):
+        return StatsInfo.get_fields(self)
+
+    def set_values(self, values):
+        for field, value in zip(StatsInfo.FIELDS, values):
+            setattr(self, field, value)
 
     @staticmethod
     def line_fit(depend, independ, num_obs):
@@ -99,9 +105,11 @@ class Stats:
     size_cir_q = 5000
     urbanization_attempt = None
     record = None
+    captured_writes = None  # (filename, text) list when a calibration worker defers its log file lines
+    tracker = None  # StatsTracker of the z grid of the current monte carlo
     average = []  # list of statsVal
     std_dev = []  # list of statsVal
-    running_total = [None] * UGMDefines.MAX_URBAN_YEARS  # list of statsVal
+    accumulator = StatsAccumulator()  # monte carlo records of every saved year, by (run, year)
     actual = []  # list of stat infos
     regression = StatsInfo()
     aggregate = {
@@ -151,8 +159,8 @@ class Stats:
         road_pixel_count = IGrid.get_road_pixel_count(Processing.get_current_year())
         excluded_pixel_count = IGrid.get_excld_count()
 
-        # Compute this year stats
-        Stats.compute_cur_year_stats()
+        # Self modification needs the population every year, the other stats only go into saved records
+        Stats.set_pop(Stats.compute_cur_year_pop())
         # Set num growth pixels
         Stats.set_num_growth_pixels(num_growth_pix)
         # Calibrate growth rate
@@ -160,17 +168,23 @@ class Stats:
         # Calibrate Percent Urban
         Stats.cal_percent_urban(total_pixels, road_pixel_count, excluded_pixel_count)
 
-        output_dir = Scenario.get_scen_value('output_dir')
-        cur_run = Processing.get_current_run()
         cur_year = Processing.get_current_year()
+        if Stats.is_saved_year(cur_year):
+            # Compute this year stats
+            Stats.compute_cur_year_stats()
+
         if IGrid.test_for_urban_year(Processing.get_current_year()):
             Stats.cal_leesalee()
-            filename = f"{output_dir}grow_{cur_run}_{cur_year}.log"
-            Stats.save(filename)
+            Stats.save()
 
         if Processing.get_processing_type() == Globals.mode_enum['predict']:
-            filename = f"{output_dir}grow_{cur_run}_{cur_year}.log"
-            Stats.save(filename)
+            Stats.save()
+
+    @staticmethod
+    def is_saved_year(year):
+        # records are saved in the control years, and in every year of a prediction
+        return IGrid.test_for_urban_year(year) or \
+            Processing.get_processing_type() == Globals.mode_enum['predict']
 
     @staticmethod
     def cal_leesalee():
@@ -184,27 +198,73 @@ class Stats:
     def compute_leesalee(z, urban):
         nrows = IGrid.nrows
         ncols = IGrid.ncols
-        union = 0
-        intersection = 0
-        total_pix = nrows * ncols
-
-        for i in range(total_pix):
-            if z[i] != 0 or urban[i] != 0:
-                union += 1
-            if z[i] != 0 and urban[i] != 0:
-                intersection += 1
+        z_urban = z != 0
+        urban_urban = urban != 0
+        union = int(np.count_nonzero(z_urban | urban_urban))
+        intersection = int(np.count_nonzero(z_urban & urban_urban))
 
         Stats.record.this_year.leesalee = intersection / union
 
+    @staticmethod
+    def reset_tracker(urban):
+        # start tracking a freshly seeded z grid
+        Stats.tracker = StatsTracker(urban, IGrid.igrid.get_slope_grid(), IGrid.nrows, IGrid.ncols)
+
+    @staticmethod
+    def add_growth(pixels):
+        if Stats.tracker is not None:
+            Stats.tracker.add(pixels)
+
+    @staticmethod
+    def compute_cur_year_pop():
+        if Stats.tracker is not None:
+            return Stats.tracker.area
+        return int(np.count_nonzero(PGrid.get_z().gridData))
+
     @staticmethod
     def compute_cur_year_stats():
         z = PGrid.get_z()
         slope = IGrid.igrid.get_slope_grid()
         stats_info = StatsInfo()
-        Stats.compute_stats(z.gridData, slope, stats_info)
+        if Stats.tracker is None:
+            Stats.compute_stats(z.gridData, slope, stats_info)
+        else:
+            Stats.set_tracked_stats(stats_info)
+            if Scenario.get_scen_value('logging') and Scenario.get_scen_value('log_debug'):
+                Stats.validate_tracked_stats(z.gridData, slope, stats_info)
         #print(f"avg slope: {stats_info.average_slope}")
         Stats.record.set_stats_info_to_record(stats_info)
 
+    @staticmethod
+    def set_tracked_stats(stats_info):
+        tracker = Stats.tracker
+        if tracker.clusters <= 0:
+            msg = "NUMBER OF CLUSTERS WAS 0, NOT ABLE TO CALCULATE MEAN CLUSTER SIZE"
+            print(msg)
+            Logger.log(msg)
+            sys.exit(1)
+
+        stats_info.area = tracker.area
+        stats_info.edges = tracker.edges
+        stats_info.pop = tracker.area
+        stats_info.clusters = tracker.clusters
+        stats_info.mean_cluster_size = tracker.get_mean_cluster_size()
+        stats_info.x_mean = tracker.x_sum / tracker.area
+        stats_info.y_mean = tracker.y_sum / tracker.area
+        stats_info.average_slope = tracker.slope_sum / tracker.area
+        stats_info.radius = math.pow((stats_info.area / math.pi), 0.5)
+
+    @staticmethod
+    def validate_tracked_stats(urban, slope, stats_info):
+        # recompute from the whole grid and keep the full values if the tracker drifted
+        full_info = StatsInfo()
+        Stats.compute_stats(urban, slope, full_info)
+        if full_info.get_values() != stats_info.get_values():
+            Logger.log(f"Tracked stats differ from a full recompute in year {Processing.get_current_year()}: "
+                       f"{stats_info.get_values()} != {full_info.get_values()}")
+            stats_info.set_values(full_info.get_values())
+            Stats.reset_tracker(urban)
+
     @staticmethod
     def cal_growth_rate():
         Stats.record.this_year.growth_rate = Stats.record.this_year.num_growth_pix / Stats.record.this_year.pop * 100
@@ -218,172 +278,26 @@ class Stats:
 
     @staticmethod
     def set_edge(urban, stats_info):
-        nrows = IGrid.nrows
-        ncols = IGrid.ncols
-
-        edges = 0
-        area = 0
-        for i in range(nrows):
-            for j in range(ncols):
-                offset = Stats.offset(i, j)
-                if urban[offset] != 0:
-                    area += 1
-                    # Check all 4 neighbors
-                    # If a neighbor is 0, it is an edge
-                    if Stats.check_all_neighbor_edge(i, j, urban):
-                        edges += 1
-        stats_info.edges = edges
-        stats_info.area = area
-
-    @staticmethod
-    def offset(i, j):
-        return i * IGrid.ncols + j
-
-    @staticmethod
-    def check_neighbor_edge(row, col, urban):
-        return Stats.in_array_bounds_edge(row, col) and urban[Stats.offset(row, col)] == 0
-
-    @staticmethod
-    def check_all_neighbor_edge(cur_row, cur_col, urban):
-        # left neighbor
-        neigh_col = cur_col
-        neigh_row = cur_row - 1
-        if Stats.check_neighbor_edge(neigh_row, neigh_col, urban):
-            return True
+        # an urban pixel is an edge when one of its 4 neighbors inside the grid is non urban
+        urban_2d = urban.reshape(IGrid.nrows, IGrid.ncols) != 0
+        non_urban = ~urban_2d
+        edge = np.zeros_like(urban_2d)
+        edge[1:, :] |= non_urban[:-1, :]
+        edge[:-1, :] |= non_urban[1:, :]
+        edge[:, 1:] |= non_urban[:, :-1]
+        edge[:, :-1] |= non_urban[:, 1:]
 
-        # right neighbor
-        neigh_row = cur_row + 1
-        if Stats.check_neighbor_edge(neigh_row, neigh_col, urban):
-            return True
-
-        # up neighbor
-        neigh_col = cur_col - 1
-        neigh_row = cur_row
-        if Stats.check_neighbor_edge(neigh_row, neigh_col, urban):
-            return True
-
-        # down neighbor
-        neigh_col = cur_col + 1
-        if Stats.check_neighbor_edge(neigh_row, neigh_col, urban):
-            return True
-
-        return False
-
-    @staticmethod
-    def in_array_bounds_edge(row, col):
-        return IGrid.nrows > row >= 0 and \
-               IGrid.ncols > col >= 0
-
-    @staticmethod
-    def check_all_neighbor_cluster(cur_row, cur_col, clusters, visited, queue):
-        sum = 0
-        # left
-        temp_row = cur_row - 1
-        temp_col = cur_col
-        result = Stats.check_neighbor_cluster(temp_row, temp_col, clusters, visited, queue)
-        sum += result
-
-        # right
-        temp_row = cur_row + 1
-        temp_col = cur_col
-        result = Stats.check_neighbor_cluster(temp_row, temp_col, clusters, visited, queue)
-        sum += result
-
-        # up
-        temp_row = cur_row
-        temp_col = cur_col - 1
-        result = Stats.check_neighbor_cluster(temp_row, temp_col, clusters, visited, queue)
-        sum += result
-
-        # down
-        temp_row = cur_row
-        temp_col = cur_col + 1
-        result = Stats.check_neighbor_cluster(temp_row, temp_col, clusters, visited, queue)
-        sum += result
-
-        return sum
-
-    @staticmethod
-    def check_neighbor_cluster(row, col, clusters, visited, queue):
-        offset = Stats.offset(row, col)
-        if Stats.in_array_bounds_edge(row, col):
-            if clusters[offset] == 1 and visited[offset] == 0:
-                visited[offset] = 1
-                queue.append((row, col))
-                return 1
-        return 0
+        stats_info.edges = int(np.count_nonzero(urban_2d & edge))
+        stats_info.area = int(np.count_nonzero(urban_2d))
 
     @staticmethod
     def set_num_cluster(urban, stats_info):
         # stats_cluster
-        nrows = IGrid.nrows
-        ncols = IGrid.ncols
-        total_pixels = nrows * ncols
-        visited = [0] * total_pixels
-        pop = 0
-        clusters = [0] * total_pixels
-        num_clusters = 0
-        sum = 0
-
-        queue = []
-
-        for i in range(total_pixels):
-            if urban[i] != 0:
-                clusters[i] = 1
-                pop += 1
-        # print(f"Pop: {pop}")
-        stats_info.pop = pop
-        for j in range(ncols):
-            clusters[Stats.offset(0, j)] = 0
-            clusters[Stats.offset(nrows - 1, j)] = 0
-
-        for i in range(nrows):
-            clusters[Stats.offset(i, 0)] = 0
-            clusters[Stats.offset(i, ncols - 1)] = 0
-
-        for i in range(1, nrows - 1):
-            for j in range(1, ncols - 1):
-                offset = Stats.offset(i, j)
-                if clusters[offset] == 1 and visited[offset] == 0:
-                    sum += 1
-                    temp_row = i
-                    temp_col = j
-                    visited[offset] = 1
-
-                    # Queue Store
-                    queue.append((temp_row, temp_col))
-
-                    once_flag = False
-                    while not once_flag or len(queue) > 0:
-                        # Queue Retrieve
-                        row, col = queue.pop()
-
-                        temp_row = row - 1
-                        temp_col = col
-                        result = Stats.check_neighbor_cluster(temp_row, temp_col, clusters, visited, queue)
-                        sum += result
-
-                        # right
-                        temp_row = row + 1
-                        temp_col = col
-                        result = Stats.check_neighbor_cluster(temp_row, temp_col, clusters, visited, queue)
-                        sum += result
-
-                        # up
-                        temp_row = row
-                        temp_col = col - 1
-                        result = Stats.check_neighbor_cluster(temp_row, temp_col, clusters, visited, queue)
-                        sum += result
-
-                        # down
-                        temp_row = row
-                        temp_col = col + 1
-                        result = Stats.check_neighbor_cluster(temp_row, temp_col, clusters, visited, queue)
-                        sum += result
-
-                        once_flag = True
-
-                    num_clusters += 1
+        urban_2d = urban.reshape(IGrid.nrows, IGrid.ncols) != 0
+        stats_info.pop = int(np.count_nonzero(urban_2d))
+
+        # pixels on the border are not counted towards any cluster
+        num_clusters, sum = ClusterLabel.count_clusters(urban_2d[1:-1, 1:-1])
 
         stats_info.clusters = num_clusters
         if num_clusters > 0:
@@ -398,20 +312,13 @@ class Stats:
     def set_circle(urban, slope, stats_info):
         nrows = IGrid.nrows
         ncols = IGrid.ncols
-        slope_mean = 0.0
-        y_mean = 0.0
-        x_mean = 0.0
-        count = 0.0
 
         # first compute the means
-        for i in range(nrows):
-            for j in range(ncols):
-                offset = Stats.offset(i, j)
-                if urban[offset] > 0:
-                    slope_mean += slope[offset]
-                    x_mean += j
-                    y_mean += i
-                    count += 1
+        rows, cols = np.nonzero(urban.reshape(nrows, ncols) > 0)
+        count = len(rows)
+        slope_mean = float(np.sum(slope[urban > 0], dtype=np.int64))
+        x_mean = float(np.sum(cols, dtype=np.int64))
+        y_mean = float(np.sum(rows, dtype=np.int64))
 
         if count <= 0:
             msg = "Something is wrong with urban, all values are zero"
@@ -434,20 +341,20 @@ class Stats:
         Stats.urbanization_attempt = UrbanizationAttempt()
 
     @staticmethod
-    def increment_z_failure():
-        Stats.urbanization_attempt.z_failure += 1
+    def increment_z_failure(count=1):
+        Stats.urbanization_attempt.z_failure += count
 
     @staticmethod
-    def increment_delta_failure():
-        Stats.urbanization_attempt.delta_failure += 1
+    def increment_delta_failure(count=1):
+        Stats.urbanization_attempt.delta_failure += count
 
     @staticmethod
-    def increment_slope_failure():
-        Stats.urbanization_attempt.slope_failure += 1
+    def increment_slope_failure(count=1):
+        Stats.urbanization_attempt.slope_failure += count
 
     @staticmethod
-    def increment_excluded_failure():
-        Stats.urbanization_attempt.excluded_failure += 1
+    def increment_excluded_failure(count=1):
+        Stats.urbanization_attempt.excluded_failure += count
 
     @staticmethod
     def increment_urban_success():
@@ -493,15 +400,6 @@ class Stats:
     def set_num_growth_pixels(val):
         Stats.record.this_year.num_growth_pix = val
 
-    @staticmethod
-    def update_running_total(idx: int):
-        if Stats.running_total[idx] is not None:
-            Stats.running_total[idx].update_stat_val(Stats.record)
-        else:
-            new_stat = StatsVal()
-            new_stat.update_stat_val(Stats.record)
-            Stats.running_total[idx] = new_stat
-
     @staticmethod
     def analyze(fmatch):
         output_dir = Scenario.get_scen_value('output_dir')
@@ -527,10 +425,10 @@ class Stats:
             # start at i = 1; i = 0 is the initial seed
             # I think I need to put a dummy stats_val to represent the initial seed
             Stats.average.append(StatsVal())
+            Stats.std_dev.append(StatsVal())
             for i in range(1, IGrid.igrid.get_num_urban()):
                 year = IGrid.igrid.get_urban_year(i)
-                Stats.calculate_averages(i)
-                Stats.process_grow_log(run, year)
+                Stats.process_year(run, year)
 
                 if write_avg_file:
                     Stats.write_stats_val_line(avg_filename, run, year, Stats.average[i], i)
@@ -540,6 +438,8 @@ class Stats:
             Stats.do_regressions()
             Stats.do_aggregate(fmatch)
             Stats.write_control_stats(control_filename)
+            if Scenario.get_scen_value('write_results_db'):
+                Stats.write_results_row(f'{output_dir}control_stats.db')
 
         if Processing.get_processing_type() == Globals.mode_enum['predict']:
             start = int(Scenario.get_scen_value('prediction_start_date'))
@@ -547,7 +447,7 @@ class Stats:
 
             for year in range(start + 1, stop + 1):
                 Stats.clear_stats()
-                Stats.process_grow_log(run, year)
+                Stats.process_year(run, year)
                 if write_avg_file:
                     Stats.write_stats_val_line(avg_filename, run, year, Stats.average[0], 0)
                 if write_std_dev_file:
@@ -608,67 +508,20 @@ class Stats:
         Stats.aggregate['product'] = product
 
     @staticmethod
-    def calculate_averages(idx):
-        temp = StatsVal()
-        total_mc = int(Scenario.get_scen_value('monte_carlo_iterations'))
-        temp.calculate_averages(total_mc, Stats.running_total[idx])
-        Stats.average.append(temp)
-
-    @staticmethod
-    def calculate_stand_dev(idx):
-        temp = StatsVal()
+    def process_year(run, year):
+        # average and standard deviation of the monte carlo records of a saved year
         total_mc = int(Scenario.get_scen_value('monte_carlo_iterations'))
-        if idx == 0 and Processing.get_processing_type() != Globals.mode_enum['predict']:
-            raise ValueError()
-        temp.calculate_sd(total_mc, Stats.record, Stats.average[idx])
-        Stats.std_dev.append(temp)
-
-    @staticmethod
-    def process_grow_log(run, year):
-        output_dir = Scenario.get_scen_value('output_dir')
-        filename = f'{output_dir}grow_{run}_{year}.log'
-        mc_iters = int(Scenario.get_scen_value('monte_carlo_iterations'))
-        mc_count = 0
-        grow_records = []
-        # if Processing.get_processing_type() != Globals.mode_enum['predict']:
-        with (open(filename, "rb")) as openfile:
-            while True:
-                try:
-                    grow_records.append(_pickle.load(openfile))
-                except EOFError:
-                    break
-
-        """print(f"****************Year {year}***********************")
-        for record in grow_records:
-            print(record)
-        print("***************************************")"""
-        if len(grow_records) > int(Scenario.get_scen_value('monte_carlo_iterations')):
+        if Stats.accumulator.get_count(run, year) > total_mc:
             raise AssertionError("Num Records is larger than Monte Carlo iters")
-        if Processing.get_processing_type() == Globals.mode_enum['predict']:
-            for record in grow_records:
-                Stats.record = record
-                Stats.update_running_total(0)
-            Stats.calculate_averages(0)
-
-        for record in grow_records:
-            Stats.record = record
-            if mc_count >= mc_iters:
-                Logger.log("mc_count >= scen_GetMonteCarloIterations ()")
-                sys.exit(1)
-            if Processing.get_processing_type() != Globals.mode_enum['predict']:
-                index = IGrid.igrid.urban_yr_to_idx(Stats.record.year)
-                Stats.calculate_stand_dev(index)
-            else:
-                Stats.calculate_stand_dev(0)
 
-            mc_count += 1
-        os.remove(filename)
+        Stats.average.append(Stats.accumulator.get_average(run, year, total_mc))
+        Stats.std_dev.append(Stats.accumulator.get_std_dev(run, year))
+        Stats.accumulator.remove(run, year)
 
     @staticmethod
     def clear_stats():
         Stats.average = []  # list of statsVal
         Stats.std_dev = []  # list of statsVal
-        Stats.running_total = [None] * UGMDefines.MAX_URBAN_YEARS  # list of statsVal
         Stats.regression = StatsInfo()
 
     @staticmethod
@@ -689,17 +542,11 @@ class Stats:
 
     @staticmethod
     def create_control_file(filename):
-        control_file = open(filename, "w")
-        header = Stats.log_control_stats_hdr()
-        control_file.write(header)
-        control_file.close()
+        OutputSink.create(filename, Stats.log_control_stats_hdr())
 
     @staticmethod
     def create_stats_val_file(filename):
-        stats_file = open(filename, "w")
-        header = Stats.log_stat_val_hdr()
-        stats_file.write(header)
-        stats_file.close()
+        OutputSink.create(filename, Stats.log_stat_val_hdr())
 
     @staticmethod
     def log_control_stats_hdr():
@@ -724,14 +571,17 @@ class Stats:
 
     @staticmethod
     def write_stats_val_line(filename, run, year, stats_val, index):
-        f = open(filename, "a")
-        f.write(f"{run:5} {year:4} {index:2}")
-        f.write(f"{stats_val}\n")
-        f.close()
+        Stats.append_to_file(filename, f"{run:5} {year:4} {index:2}{stats_val}\n")
+
+    @staticmethod
+    def append_to_file(filename, text):
+        if Stats.captured_writes is not None:
+            Stats.captured_writes.append((filename, text))
+        else:
+            OutputSink.write(filename, text)
 
     @staticmethod
     def write_control_stats(filename):
-        control_file = open(filename, 'a')
         str = f"{Processing.get_current_run():5} " \
               f"{Stats.aggregate['product']:8.5f} " \
               f"{Stats.aggregate['compare']:7.5f} " \
@@ -752,8 +602,32 @@ class Stats:
               f"{Coeff.get_saved_slope_resistance():4.0f} " \
               f"{Coeff.get_saved_road_gravity():4.0f}\n"
 
-        control_file.write(str)
-        control_file.close()
+        Stats.append_to_file(filename, str)
+
+    @staticmethod
+    def write_results_row(filename):
+        row = (Processing.get_current_run(),
+               Stats.aggregate['product'],
+               Stats.aggregate['compare'],
+               Stats.regression.pop,
+               Stats.regression.edges,
+               Stats.regression.clusters,
+               Stats.regression.mean_cluster_size,
+               Stats.aggregate['leesalee'],
+               Stats.regression.average_slope,
+               Stats.regression.percent_urban,
+               Stats.regression.x_mean,
+               Stats.regression.y_mean,
+               Stats.regression.radius,
+               Stats.aggregate['fmatch'],
+               int(Coeff.get_saved_diffusion()),
+               int(Coeff.get_saved_breed()),
+               int(Coeff.get_saved_spread()),
+               int(Coeff.get_saved_slope_resistance()),
+               int(Coeff.get_saved_road_gravity()),
+               int(Scenario.get_scen_value('monte_carlo_iterations')),
+               TimerUtility.read_current_call('drv_driver'))
+        ResultsStore.add_run(filename, row)
 
     @staticmethod
     def log_urbanization_attempts():
@@ -767,49 +641,11 @@ class Stats:
         Logger.log(f"Total Attempts             = {total}")
 
     @staticmethod
-    def save(filename):
+    def save():
         Stats.record.run = Processing.get_current_run()
         Stats.record.monte_carlo = Processing.get_current_monte()
         Stats.record.year = Processing.get_current_year()
-        index = 0
-        if Processing.get_processing_type() != Globals.mode_enum['predict']:
-            index = IGrid.igrid.urban_yr_to_idx(Stats.record.year)
-
-        Stats.update_running_total(index)
-
-        # Now we are writing the record to file for now...
-        if Stats.record.monte_carlo == 0:
-            # Create file
-            with open(filename, 'wb') as output:  # Overwrites any existing file.
-                _pickle.dump(Stats.record, output, -1)
-        else:
-            with open(filename, 'ab') as output:
-                _pickle.dump(Stats.record, output, -1)
-
-
-class UgmMapping:
-    def __init__(self):
-        self.row = 0
-        self.col = 0
-
-    def set_row(self, row):
-        self.row = row
-
-    def set_col(self, col):
-        self.col = col
-
-    def set_row_col(self, row, col):
-        self.row = row
-        self.col = col
-
-    def get_row(self):
-        return self.row
-
-    def get_col(self):
-        return self.col
-
-    def __str__(self):
-        return f"{self.row} {self.col}"
+        Stats.accumulator.add(Stats.record.run, Stats.record.year, Stats.record.this_year)
 
 
 class UrbanizationAttempt:
@@ -825,6 +661,8 @@ class UrbanizationAttempt:
 
 
 class Record:
+    __slots__ = ("this_year", "year", "monte_carlo", "run")
+
     def __init__(self):
         self.this_year = StatsVal()
         self.year = 0
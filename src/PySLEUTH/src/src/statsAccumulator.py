@@ -0,0 +1,60 @@
+import numpy as np
+from statsVal import StatsVal
+
+
+class StatsAccumulator:
+    """
+    Running sums and Welford mean / sum of squared deviations of every StatsVal field, kept per
+    (run, year) over the monte carlo records. Partial accumulators of separate replicas merge exactly
+    in their sums, so the averages do not depend on where the replicas ran.
+    """
+
+    def __init__(self):
+        self.entries = {}  # (run, year) -> [count, sums, means, m2s]
+
+    def add(self, run, year, stats_val):
+        values = stats_val.get_values()
+        entry = self.entries.get((run, year))
+        if entry is None:
+            self.entries[(run, year)] = [1, 0.0 + values, values.copy(), np.zeros(len(values))]
+            return
+
+        entry[0] += 1
+        entry[1] += values
+        delta = values - entry[2]
+        entry[2] += delta / entry[0]
+        entry[3] += delta * (values - entry[2])
+
+    def merge(self, other):
+        # add the entries of another accumulator, combining the variances with Chan's formula
+        for key, (count, sums, means, m2s) in other.entries.items():
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = [count, sums.copy(), means.copy(), m2s.copy()]
+                continue
+
+            total = entry[0] + count
+            delta = means - entry[2]
+            entry[1] += sums
+            entry[2] += delta * count / total
+            entry[3] += m2s + delta * delta * entry[0] * count / total
+            entry[0] = total
+
+    def get_count(self, run, year):
+        entry = self.entries.get((run, year))
+        return 0 if entry is None else entry[0]
+
+    def get_average(self, run, year, total_mc):
+        average = StatsVal()
+        average.set_values(self.entries[(run, year)][1] / total_mc)
+        return average
+
+    def get_std_dev(self, run, year):
+        # population standard deviation over the records of the year
+        count, sums, means, m2s = self.entries[(run, year)]
+        std_dev = StatsVal()
+        std_dev.set_values(np.sqrt(m2s / count))
+        return std_dev
+
+    def remove(self, run, year):
+        self.entries.pop((run, year), None)
@@ -0,0 +1,108 @@
+import numpy as np
+
+
+class StatsTracker:
+    """
+    Running urban statistics of a z grid that only gains urban pixels. The sums, the edge pixels and a
+    union-find over the cluster pixels are updated from the pixels added each year, so the cost of a
+    year follows the growth instead of the grid size.
+    """
+
+    def __init__(self, urban, slope, nrows, ncols):
+        self.nrows = nrows
+        self.ncols = ncols
+        self.width = ncols + 2
+        self.slope = slope
+
+        # urban mask with a one pixel frame that counts as urban, so frame pixels never make an edge
+        self.padded = np.ones((nrows + 2) * self.width, dtype=bool)
+        self.padded.reshape(nrows + 2, self.width)[1:-1, 1:-1] = False
+        self.edge = np.zeros(len(self.padded), dtype=bool)
+        # union-find over padded indices, parent[p] <= p so the root of a cluster is its first pixel
+        self.parent = np.arange(len(self.padded))
+
+        self.area = 0
+        self.edges = 0
+        self.clusters = 0
+        self.cluster_pixels = 0
+        self.x_sum = 0
+        self.y_sum = 0
+        self.slope_sum = 0
+
+        self.add(np.flatnonzero(urban))
+
+    def add(self, pixels):
+        """
+        Adds the newly urban pixels, given as flat grid indices
+        """
+        if len(pixels) == 0:
+            return
+
+        rows = pixels // self.ncols
+        cols = pixels % self.ncols
+        padded = (rows + 1) * self.width + cols + 1
+        self.padded[padded] = True
+
+        self.area += len(pixels)
+        self.x_sum += int(np.sum(cols, dtype=np.int64))
+        self.y_sum += int(np.sum(rows, dtype=np.int64))
+        self.slope_sum += int(np.sum(self.slope[pixels], dtype=np.int64))
+
+        # only the new pixels and their neighbors can change edge status
+        offsets = np.array([0, -self.width, self.width, -1, 1])
+        touched = np.unique((padded[:, None] + offsets).ravel())
+        touched = touched[self.__is_inside(touched)]
+        now_edge = self.padded[touched] & ~(self.padded[touched - self.width] & self.padded[touched + self.width] &
+                                            self.padded[touched - 1] & self.padded[touched + 1])
+        self.edges += int(np.count_nonzero(now_edge)) - int(np.count_nonzero(self.edge[touched]))
+        self.edge[touched] = now_edge
+
+        # pixels on the border are not counted towards any cluster
+        interior = (rows > 0) & (rows < self.nrows - 1) & (cols > 0) & (cols < self.ncols - 1)
+        padded = padded[interior]
+        self.clusters += len(padded)
+        self.cluster_pixels += len(padded)
+
+        below = np.repeat(padded, 4)
+        above = (padded[:, None] + offsets[1:]).ravel()
+        joined = self.padded[above] & self.__is_interior(above)
+        self.__union(below[joined], above[joined])
+
+    def get_mean_cluster_size(self):
+        return self.cluster_pixels / self.clusters
+
+    def __is_inside(self, padded):
+        rows = padded // self.width
+        cols = padded % self.width
+        return (rows > 0) & (rows <= self.nrows) & (cols > 0) & (cols <= self.ncols)
+
+    def __is_interior(self, padded):
+        rows = padded // self.width
+        cols = padded % self.width
+        return (rows > 1) & (rows < self.nrows) & (cols > 1) & (cols < self.ncols)
+
+    def __find(self, nodes):
+        roots = self.parent[nodes]
+        while True:
+            next_roots = self.parent[roots]
+            if np.array_equal(next_roots, roots):
+                break
+            roots = next_roots
+        self.parent[nodes] = roots
+        return roots
+
+    def __union(self, a, b):
+        # hook the larger root of every pair under the smaller one until every pair shares a root
+        while len(a) > 0:
+            root_a = self.__find(a)
+            root_b = self.__find(b)
+            apart = root_a != root_b
+            a = a[apart]
+            b = b[apart]
+            if len(a) == 0:
+                break
+
+            hi = np.maximum(root_a[apart], root_b[apart])
+            lo = np.minimum(root_a[apart], root_b[apart])
+            np.minimum.at(self.parent, hi, lo)
+            self.clusters -= len(np.unique(hi))
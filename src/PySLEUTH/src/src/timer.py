@@ -90,11 +90,38 @@ class TimerUtility:
         timer = TimerUtility.timers[key]
         return timer.read()
 
+    @staticmethod
+    def read_current_call(key):
+        # time since the running timer was started, without its earlier calls
+        timer = TimerUtility.timers[key]
+        return timer.read() - timer.total_time
+
     @staticmethod
     def stop_timer(key):
         timer = TimerUtility.timers[key]
         timer.stop()
 
+    @staticmethod
+    def get_totals(since=None):
+        """
+        Calls and total time of every timer, less those in since when given, so a forked worker can hand
+        back the time it spent
+        """
+        totals = {key: (timer.num_calls, timer.total_time) for key, timer in TimerUtility.timers.items()}
+        if since is not None:
+            totals = {key: (num_calls - since[key][0], total_time - since[key][1])
+                      for key, (num_calls, total_time) in totals.items()}
+        return totals
+
+    @staticmethod
+    def add_totals(totals):
+        for key, (num_calls, total_time) in totals.items():
+            timer = TimerUtility.timers[key]
+            timer.num_calls += num_calls
+            timer.total_time += total_time
+            if timer.num_calls > 0:
+                timer.average_time = timer.total_time / timer.num_calls
+
     @staticmethod
     def log_timers():
         Logger.log("\n\n****************************LOG OF TIMINGS***********************************")
@@ -6,13 +6,13 @@ from processing import Processing
 from globals import Globals
 from imageIO import ImageIO
 from color import Color
+import numpy as np
 
 
 class Utilities:
     @staticmethod
     def init_grid(gif):
-        for i in range(len(gif)):
-            gif[i] = 0
+        gif.fill(0)
 
     @staticmethod
     def get_neighbor(i_in, j_in):
@@ -23,21 +23,15 @@ class Utilities:
 
     @staticmethod
     def condition_gif(source, target):
-        for i in range(len(source)):
-            if source[i] > 0:
-                target[i] = UGMDefines.PHASE0G
+        target[source > 0] = UGMDefines.PHASE0G
 
     @staticmethod
     def condition_gt_gif(source, cmp_value, target, set_value):
-        for i in range(len(source)):
-            if source[i] > cmp_value:
-                target[i] = set_value
+        target[source > cmp_value] = set_value
 
     @staticmethod
     def condition_ge_gif(source, cmp_value, target, set_value):
-        for i in range(len(source)):
-            if source[i] >= cmp_value:
-                target[i] = set_value
+        target[source >= cmp_value] = set_value
 
     @staticmethod
     def write_z_prob_grid(z, name):
@@ -103,32 +97,20 @@ class Utilities:
 
     @staticmethod
     def map_grid_to_index(grid_in, l_bound, u_bound, index, total_pix):
-        grid_out = [0] * total_pix
-        for i in range(total_pix):
-            for j in range(len(l_bound)):
-                if l_bound[j] <= grid_in[i] <= u_bound[j]:
-                    grid_out[i] = index[j]
-                    break
-                else:
-                    grid_out[i] = grid_in[i]
+        # pixels outside of every bound keep their value, the first matching bound wins
+        grid_in = np.asarray(grid_in)[:total_pix]
+        grid_out = grid_in.copy()
+        mapped = np.zeros(total_pix, dtype=bool)
+        for j in range(len(l_bound)):
+            in_bound = (l_bound[j] <= grid_in) & (grid_in <= u_bound[j]) & ~mapped
+            grid_out[in_bound] = index[j]
+            mapped |= in_bound
 
         return grid_out
 
     @staticmethod
     def overlay(layer0, layer1):
-        nrows = IGrid.nrows
-        ncols = IGrid.ncols
-        total_pix = nrows * ncols
-
-        out = [0] * total_pix
-
-        for i in range(total_pix):
-            if layer1[i] > 0:
-                out[i] = layer1[i]
-            else:
-                out[i] = layer0[i]
-
-        return out
+        return np.where(layer1 > 0, layer1, layer0)
 
     @staticmethod
     def overlay_seed(z_prob, total_pix):
@@ -145,12 +127,7 @@ class Utilities:
 
     @staticmethod
     def img_intersection(grid1, grid2):
-        count = 0
-        for i in range(len(grid1)):
-            if grid1[i] == grid2[i]:
-                count += 1
-
-        return count
+        return int(np.count_nonzero(grid1 == grid2))
 
 
 
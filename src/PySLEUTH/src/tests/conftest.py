@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the model modules import each other by bare name, as they do when main.py runs from src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
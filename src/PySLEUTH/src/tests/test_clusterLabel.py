@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from clusterLabel import ClusterLabel
+
+
+def flood_fill_clusters(mask):
+    # the original labelling: a breadth first flood fill over the 4-neighbors of every unvisited pixel
+    nrows, ncols = mask.shape
+    visited = np.zeros_like(mask)
+    num_clusters = 0
+    num_pixels = 0
+    for i in range(nrows):
+        for j in range(ncols):
+            if mask[i, j] and not visited[i, j]:
+                num_clusters += 1
+                visited[i, j] = True
+                queue = [(i, j)]
+                while queue:
+                    row, col = queue.pop()
+                    num_pixels += 1
+                    for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                        if 0 <= r < nrows and 0 <= c < ncols and mask[r, c] and not visited[r, c]:
+                            visited[r, c] = True
+                            queue.append((r, c))
+    return num_clusters, num_pixels
+
+
+@pytest.mark.parametrize("density", [0.0, 0.1, 0.45, 0.6, 0.9, 1.0])
+def test_random_masks_match_flood_fill(density):
+    rng = np.random.default_rng(int(density * 100))
+    for shape in ((1, 1), (1, 40), (40, 1), (33, 47)):
+        mask = rng.random(shape) < density
+        assert ClusterLabel.count_clusters(mask) == flood_fill_clusters(mask)
+
+
+def test_shapes_joined_late_match_flood_fill():
+    # combs and a spiral join runs that look separate until rows far below
+    comb = np.zeros((12, 21), dtype=bool)
+    comb[:, ::2] = True
+    comb[-1, :] = True
+    reversed_comb = comb[::-1, ::-1].copy()
+
+    spiral = np.zeros((15, 15), dtype=bool)
+    top, left, bottom, right = 0, 0, 14, 14
+    while top <= bottom and left <= right:
+        spiral[top, left:right + 1] = True
+        spiral[top:bottom + 1, right] = True
+        spiral[bottom, left:right + 1] = True
+        spiral[top + 2:bottom + 1, left] = True
+        top, left, bottom, right = top + 2, left + 2, bottom - 2, right - 2
+
+    for mask in (comb, reversed_comb, spiral, ~spiral):
+        assert ClusterLabel.count_clusters(mask) == flood_fill_clusters(mask)
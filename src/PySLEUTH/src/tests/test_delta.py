@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from delta import Deltatron
+from igrid import IGrid
+from landClass import LandClass
+from rand import Random
+from scenario import Scenario
+from ugm_defines import UGMDefines
+from utilities import Utilities
+
+
+def pixel_phase1(drive, urban_land, slope, deltatron, landuse_classes, class_indices, new_indices, class_slope,
+                 ftransition, nrows, ncols):
+    # the original phase 1 with class lookups per pixel, fed the same batch of cluster centres
+    num_classes = len(landuse_classes)
+    phase1_land = list(urban_land)
+    transitional = [offset for offset in range(nrows * ncols) if landuse_classes[new_indices[urban_land[offset]]].trans]
+    centers = [transitional[k] for k in Random.get_ints(drive, 0, len(transitional) - 1).tolist()]
+    for offset in centers:
+        i_center, j_center = divmod(offset, ncols)
+        new_landuse = Deltatron.get_new_landuse(class_indices, landuse_classes, slope[offset], class_slope)
+        new_j = new_indices[new_landuse]
+        if Random.get_float() < ftransition[new_indices[urban_land[offset]] * num_classes + new_j]:
+            phase1_land[offset] = new_landuse
+            deltatron[offset] = 1
+            i, j = i_center, j_center
+            for regions in range(UGMDefines.REGION_SIZE):
+                if Random.get_int(0, 7) == 7:
+                    i, j = i_center, j_center
+                i, j = Utilities.get_neighbor(i, j)
+                if 0 <= i < nrows and 0 <= j < ncols:
+                    offset = i * ncols + j
+                    if Random.get_float() < ftransition[new_indices[urban_land[offset]] * num_classes + new_j]:
+                        if landuse_classes[new_indices[urban_land[offset]]].trans:
+                            phase1_land[offset] = new_landuse
+                            deltatron[offset] = 1
+                        i, j = Utilities.get_neighbor(i, j)
+                        if 0 <= i < nrows and 0 <= j < ncols:
+                            offset = i * ncols + j
+                            if landuse_classes[new_indices[urban_land[offset]]].trans:
+                                phase1_land[offset] = new_landuse
+                                deltatron[offset] = 1
+    return phase1_land
+
+
+def pixel_phase2(urban_land, phase1_land, deltatron, landuse_classes, new_indices, ftransition, nrows, ncols):
+    # the original phase 2: every interior pixel in turn, with the same draws
+    neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+    phase2_land = list(phase1_land)
+    for i in range(1, nrows - 1):
+        for j in range(1, ncols - 1):
+            offset = i * ncols + j
+            if landuse_classes[new_indices[phase1_land[offset]]].trans and deltatron[offset] == 0:
+                neighbors = sum(deltatron[(i + x) * ncols + j + y] == 2 for x, y in neighbor_options)
+                if neighbors >= 1 + Random.get_int(0, 1):
+                    for tries in range(16):
+                        i_neigh, j_neigh = Utilities.get_neighbor(i, j)
+                        offset_neigh = i_neigh * ncols + j_neigh
+                        if deltatron[offset_neigh] == 2:
+                            trans = new_indices[phase2_land[offset]] * len(landuse_classes) + \
+                                    new_indices[urban_land[offset_neigh]]
+                            if Random.get_float() < ftransition[trans]:
+                                phase2_land[offset] = urban_land[offset_neigh]
+                                deltatron[offset] = 1
+                            break
+
+    deltatron[deltatron > 0] += 1
+    deltatron[deltatron > UGMDefines.MIN_YEARS_BETWEEN_TRANSITIONS] = 0
+    return phase2_land
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_phase2_matches_pixel_loop(monkeypatch, seed):
+    nrows, ncols = 26, 34
+    landuse_classes = [SimpleNamespace(trans=trans) for trans in (False, True, True, False, True)]
+    monkeypatch.setattr(IGrid, "nrows", nrows)
+    monkeypatch.setattr(IGrid, "ncols", ncols)
+    monkeypatch.setattr(LandClass, "landuse_classes", landuse_classes)
+    monkeypatch.setattr(Scenario, "scenario", {"view_deltatron_aging": False})
+
+    rng = np.random.default_rng(seed)
+    new_indices = [k if k < len(landuse_classes) else 0 for k in range(256)]
+    ftransition = rng.random(len(landuse_classes) ** 2).tolist()
+    urban_land = rng.integers(0, len(landuse_classes), nrows * ncols).astype(np.uint8)
+    phase1_land = urban_land.copy()
+    phase1_land[rng.random(nrows * ncols) < 0.2] = 2
+    deltatron = np.where(rng.random(nrows * ncols) < 0.3, rng.integers(1, 4, nrows * ncols), 0).astype(np.uint8)
+
+    expected_deltatron = deltatron.copy()
+    Random.set_seed(seed)
+    expected = pixel_phase2(urban_land, phase1_land, expected_deltatron, landuse_classes, new_indices, ftransition,
+                            nrows, ncols)
+
+    Random.set_seed(seed)
+    phase2_land = Deltatron.phase2(urban_land, phase1_land, deltatron, landuse_classes, new_indices, ftransition)
+    assert phase2_land.tolist() == expected
+    assert deltatron.tolist() == expected_deltatron.tolist()
+
+
+@pytest.fixture
+def land_classes(monkeypatch):
+    nrows, ncols = 26, 34
+    landuse_classes = [SimpleNamespace(num=10 * k, trans=trans, idx=k)
+                       for k, trans in enumerate((False, True, True, False, True))]
+    monkeypatch.setattr(IGrid, "nrows", nrows)
+    monkeypatch.setattr(IGrid, "ncols", ncols)
+    monkeypatch.setattr(LandClass, "landuse_classes", landuse_classes)
+    new_indices = [0] * 256
+    for k, landuse_class in enumerate(landuse_classes):
+        new_indices[landuse_class.num] = k
+    return nrows, ncols, landuse_classes, new_indices
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_phase1_matches_class_lookups(land_classes, seed):
+    nrows, ncols, landuse_classes, new_indices = land_classes
+    class_indices = [landuse_class for landuse_class in landuse_classes if landuse_class.trans]
+    rng = np.random.default_rng(seed)
+    class_slope = rng.random(len(landuse_classes)) * 20
+    ftransition = rng.random(len(landuse_classes) ** 2).tolist()
+    urban_land = (rng.integers(0, len(landuse_classes), nrows * ncols) * 10).astype(np.uint8)
+    slope = rng.integers(0, 40, nrows * ncols).astype(np.uint8)
+    deltatron = np.zeros(nrows * ncols, dtype=np.uint8)
+
+    expected_deltatron = deltatron.copy()
+    Random.set_seed(seed)
+    expected = pixel_phase1(30, urban_land, slope, expected_deltatron, landuse_classes, class_indices, new_indices,
+                            class_slope, ftransition, nrows, ncols)
+
+    Random.set_seed(seed)
+    phase1_land = Deltatron.phase1(30, urban_land, slope, deltatron, landuse_classes, class_indices, new_indices,
+                                   class_slope, ftransition)
+    assert phase1_land.tolist() == expected
+    assert deltatron.tolist() == expected_deltatron.tolist()
+    assert phase1_land.tolist() != urban_land.tolist()
+
+
+def test_phase1_without_transitional_pixels(land_classes):
+    nrows, ncols, landuse_classes, new_indices = land_classes
+    urban_land = np.full(nrows * ncols, 30, dtype=np.uint8)
+    deltatron = np.zeros(nrows * ncols, dtype=np.uint8)
+
+    Random.set_seed(0)
+    phase1_land = Deltatron.phase1(30, urban_land, urban_land, deltatron, landuse_classes, [], new_indices,
+                                   [0.0] * len(landuse_classes), [1.0] * len(landuse_classes) ** 2)
+    assert phase1_land.tolist() == urban_land.tolist()
+    assert phase1_land is not urban_land
+    assert not deltatron.any()
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+import numpy as np
+from grid import Grid
+from igrid import IGrid
+from pgrid import PGrid
+from scenario import Scenario
+
+
+def make_grid(data):
+    grid = Grid()
+    grid.init_grid_data(len(data))
+    grid.gridData[:] = data
+    grid.max = int(data.max())
+    return grid
+
+
+def test_working_grids_are_flat_typed_arrays(monkeypatch):
+    for name in ("z", "deltatron", "delta", "land1", "land2", "cumulate"):
+        monkeypatch.setattr(PGrid, name, None)
+    PGrid.init(7, 9)
+
+    for grid in (PGrid.z, PGrid.deltatron, PGrid.delta, PGrid.land1, PGrid.land2):
+        assert (grid.gridData.dtype, grid.gridData.shape) == (np.uint8, (63,))
+        assert not grid.gridData.any()
+    assert (PGrid.cumulate.gridData.dtype, PGrid.cumulate.gridData.shape) == (np.float64, (63,))
+
+
+def test_histogram_matches_pixel_count():
+    data = np.random.default_rng(0).integers(0, 256, 500).astype(np.uint8)
+    grid = make_grid(data)
+    grid.fill_histogram()
+
+    histogram = [0] * 256
+    for value in data.tolist():
+        histogram[value] += 1
+    assert grid.histogram.tolist() == histogram
+
+
+def test_normalize_roads_matches_pixel_loop(monkeypatch, tmp_path):
+    rng = np.random.default_rng(1)
+    roads = [make_grid(rng.integers(0, top + 1, 300).astype(np.uint8)) for top in (255, 100, 37)]
+    monkeypatch.setattr(IGrid, "igrid", SimpleNamespace(road=roads))
+    monkeypatch.setattr(IGrid, "cached_roads", None)
+    monkeypatch.setattr(IGrid, "total_pixels", 300)
+    monkeypatch.setattr(Scenario, "scenario", {"output_dir": f"{tmp_path}/"})
+
+    # the original per pixel scaling
+    max_road_max = max(road.max for road in roads)
+    expected = [[int(((100 * pixel) / road.max) * (float(road.max) / float(max_road_max)))
+                 for pixel in road.gridData.tolist()] for road in roads]
+
+    IGrid.normalize_roads()
+    assert [road.gridData.tolist() for road in roads] == expected
+    assert all(road.gridData.dtype == np.uint8 for road in roads)
@@ -0,0 +1,71 @@
+import os
+import numpy as np
+import pytest
+from globals import Globals
+from growth import Grow
+from igrid import IGrid
+from processing import Processing
+from scenario import Scenario
+from utilities import Utilities
+
+NUM_MONTE = 4
+FIRST_YEAR, STOP_YEAR = 1991, 1994
+TOTAL_PIXELS = 150
+
+
+@pytest.fixture
+def non_landuse(monkeypatch, tmp_path):
+    monkeypatch.setattr(Scenario, "scenario", {"monte_carlo_iterations": str(NUM_MONTE),
+                                               "output_dir": f"{tmp_path}/"})
+    monkeypatch.setattr(IGrid, "total_pixels", TOTAL_PIXELS)
+    monkeypatch.setattr(Processing, "stop_year", STOP_YEAR)
+    monkeypatch.setattr(Processing, "current_monte_carlo", -1)
+    monkeypatch.setattr(Processing, "current_year", 0)
+    monkeypatch.setattr(Grow, "monte_carlo_counts", None)
+    monkeypatch.setattr(Grow, "monte_carlo_counts_file", "")
+    written = []
+    monkeypatch.setattr(Utilities, "write_z_prob_grid", lambda grid, name: written.append(
+        (Processing.get_current_year(), grid.gridData.tolist())))
+    return written
+
+
+def run_replicas(mode, urban):
+    Processing.set_processing_type(Globals.mode_enum[mode])
+    for imc in range(NUM_MONTE):
+        Processing.set_current_monte(imc)
+        for year in range(FIRST_YEAR, STOP_YEAR + 1):
+            Processing.set_current_year(year)
+            Grow.grow_non_landuse(urban[imc, year - FIRST_YEAR])
+
+
+def file_counts(mode, urban):
+    # what the per replica cumulate_monte_carlo.year_<Y> files held after the last replica
+    expected = []
+    for year in range(FIRST_YEAR, STOP_YEAR + 1):
+        counts = [0.0] * TOTAL_PIXELS
+        for imc in range(NUM_MONTE):
+            for i in range(TOTAL_PIXELS):
+                if urban[imc, year - FIRST_YEAR, i] > 0:
+                    counts[i] += 1
+        for i in range(TOTAL_PIXELS):
+            if mode == "test":
+                if urban[NUM_MONTE - 1, year - FIRST_YEAR, i] > 0:
+                    counts[i] = 100
+            else:
+                counts[i] = 100 * counts[i] / NUM_MONTE
+        expected.append((year, counts))
+    return expected
+
+
+@pytest.mark.parametrize("mode", ["test", "predict"])
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_counts_match_cumulate_files(non_landuse, monkeypatch, tmp_path, mode, in_memory):
+    if not in_memory:
+        monkeypatch.setattr(Grow, "MAX_IN_MEMORY_COUNTS", 0)
+    rng = np.random.default_rng(0)
+    urban = (rng.random((NUM_MONTE, STOP_YEAR - FIRST_YEAR + 1, TOTAL_PIXELS)) < 0.4).astype(np.uint8)
+
+    run_replicas(mode, urban)
+    assert non_landuse == file_counts(mode, urban)
+    assert Grow.monte_carlo_counts is None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from PIL import Image
+from color import ColorTable
+from grid import Grid
+from imageIO import ImageIO
+from scenario import Scenario
+
+NROWS, NCOLS = 19, 27
+
+
+@pytest.fixture(autouse=True)
+def image_scenario(monkeypatch):
+    monkeypatch.setattr(Scenario, "scenario", {"date_color": "0xffffff", "logging": False})
+
+
+def make_grid(data):
+    grid = Grid()
+    grid.init_grid_data(len(data), data.dtype)
+    grid.gridData[:] = data
+    return grid
+
+
+def grayscale_table():
+    colortable = ColorTable(256, "GRAYSCALE_COLORMAP")
+    colortable.color = [(val, val, val) for val in range(256)]
+    return colortable
+
+
+def pixel_read(filename):
+    # the original decode: every pixel through getpixel, kept only when it is a true gray
+    im = Image.open(filename).convert('RGB')
+    values = {}
+    for i in range(NROWS):
+        for j in range(NCOLS):
+            r, g, b = im.getpixel((j, i))
+            if r == g == b:
+                values[i * NCOLS + j] = r
+    return values
+
+
+def test_read_keeps_only_gray_pixels(tmp_path, capsys):
+    rng = np.random.default_rng(1)
+    rgb = np.repeat(rng.integers(0, 256, (NROWS, NCOLS, 1)), 3, axis=2).astype(np.uint8)
+    rgb[3, 4] = (10, 20, 30)
+    rgb[7, 0] = (200, 0, 0)
+    filename = str(tmp_path / "color.png")
+    Image.fromarray(rgb).save(filename)
+
+    grid = make_grid(np.full(NROWS * NCOLS, 99, dtype=np.uint8))
+    ImageIO.read_gif(grid, filename, NROWS, NCOLS)
+
+    expected = [99] * (NROWS * NCOLS)
+    for offset, value in pixel_read(filename).items():
+        expected[offset] = value
+    assert grid.gridData.tolist() == expected
+    assert "2 pixels" in capsys.readouterr().out
+
+
+def test_read_grayscale_image(tmp_path):
+    data = np.random.default_rng(2).integers(3, 250, (NROWS, NCOLS)).astype(np.uint8)
+    filename = str(tmp_path / "gray.gif")
+    Image.fromarray(data, 'L').save(filename)
+
+    grid = make_grid(np.zeros(NROWS * NCOLS, dtype=np.uint8))
+    ImageIO.read_gif(grid, filename, NROWS, NCOLS)
+    assert grid.gridData.tolist() == list(pixel_read(filename).values())
+    assert (grid.min, grid.max) == (int(data.min()), int(data.max()))
+
+
+@pytest.mark.parametrize("extension", ["gif", "tif"])
+def test_write_then_read_round_trip(tmp_path, extension):
+    data = np.random.default_rng(0).integers(0, 256, NROWS * NCOLS).astype(np.uint8)
+    filename = str(tmp_path / f"grid.{extension}")
+    ImageIO.write_gif(make_grid(data), grayscale_table(), filename, None, NROWS, NCOLS)
+
+    grid = make_grid(np.zeros(NROWS * NCOLS, dtype=np.uint8))
+    ImageIO.read_gif(grid, filename, NROWS, NCOLS)
+    assert grid.gridData.tolist() == data.tolist()
+    assert (grid.min, grid.max) == (int(data.min()), int(data.max()))
+
+
+def test_write_truncates_fractional_values(tmp_path):
+    data = np.linspace(0, 100, NROWS * NCOLS)
+    filename = str(tmp_path / "grid.gif")
+    ImageIO.write_gif(make_grid(data), grayscale_table(), filename, None, NROWS, NCOLS)
+
+    assert np.asarray(Image.open(filename)).ravel().tolist() == [int(value) for value in data]
+
+
+def test_date_drawn_in_date_color_entry(tmp_path):
+    data = np.full(NROWS * NCOLS, 40, dtype=np.uint8)
+    filename = str(tmp_path / "dated.gif")
+    ImageIO.write_gif(make_grid(data), grayscale_table(), filename, "1990", NROWS, NCOLS)
+
+    im = Image.open(filename)
+    assert im.mode == 'P'
+    # the label is drawn in date_color alone, without blended edge colors
+    colors = np.unique(np.asarray(im.convert('RGB')).reshape(-1, 3), axis=0)
+    assert colors.tolist() == [[40, 40, 40], [255, 255, 255]]
@@ -0,0 +1,53 @@
+import numpy as np
+from grid import Grid
+from inputCache import InputCache
+
+
+def make_grids(tmp_path):
+    grids = []
+    for i, year in enumerate((1930, 1990)):
+        grid = Grid()
+        grid.filename = str(tmp_path / f"urban.{year}.gif")
+        grid.year = year
+        grid.gridData = np.arange(20, dtype=np.uint8) * (i + 1)
+        grid.fill_histogram()
+        grid.min, grid.max = int(grid.gridData.min()), int(grid.gridData.max())
+        with open(grid.filename, "wb") as file:
+            file.write(grid.gridData.tobytes())
+        grids.append(grid)
+    return grids
+
+
+def test_key_follows_files_and_settings(tmp_path):
+    grids = make_grids(tmp_path)
+    key = InputCache.get_key(grids, ["logging True"])
+    assert InputCache.get_key(grids, ["logging True"]) == key
+    assert InputCache.get_key(grids, ["logging False"]) != key
+
+    with open(grids[1].filename, "ab") as file:
+        file.write(b"\0")
+    assert InputCache.get_key(grids, ["logging True"]) != key
+
+
+def test_cold_then_warm_round_trip(tmp_path):
+    grids = make_grids(tmp_path)
+    path = InputCache.get_path(str(tmp_path), InputCache.get_key(grids, []))
+    assert InputCache.load(path) is None
+
+    roads = [np.array([0, 50, 100], dtype=np.uint8)]
+    InputCache.save(path, grids, [grid.gridData for grid in grids], roads, [2], [1.5], 3, "Validation OK\n")
+    # a second save of the same entry leaves the first in place
+    InputCache.save(path, grids, [grid.gridData for grid in grids], roads, [2], [1.5], 3, "Validation OK\n")
+
+    for shared in (False, True):
+        entry = InputCache.load(path, shared)
+        for i, grid in enumerate(grids):
+            assert np.array_equal(entry[f"grid_{i}"], grid.gridData)
+            assert np.array_equal(entry["histograms"][i], grid.histogram)
+            assert entry["min_max"][i].tolist() == [grid.min, grid.max]
+        assert np.array_equal(entry["road_0"], roads[0])
+        assert entry["road_pixel_count"].tolist() == [2]
+        assert entry["percent_road"].tolist() == [1.5]
+        assert int(entry["excld_count"]) == 3
+        assert str(entry["validation_log"]) == "Validation OK\n"
+        assert entry["grid_0"].flags.writeable != shared
@@ -0,0 +1,73 @@
+import io
+import numpy as np
+import pytest
+from landClass import LandClass
+from logger import Logger
+from scenario import Scenario
+
+NUM_CLASSES = 5
+
+
+@pytest.fixture
+def land_scenario(monkeypatch):
+    monkeypatch.setattr(Scenario, "scenario", {"monte_carlo_iterations": "12", "landuse_data_file": ["land"]})
+    monkeypatch.setattr(LandClass, "landuse_classes", [object()] * NUM_CLASSES)
+    monkeypatch.setattr(LandClass, "annual_prob", None)
+    # class values 0, 10, 20, 30 and 40, everything else maps past the last class
+    new_indices = [NUM_CLASSES] * 256
+    for k in range(NUM_CLASSES):
+        new_indices[10 * k] = k
+    monkeypatch.setattr(LandClass, "new_indices", new_indices)
+
+
+def pixel_prob(lands, total_pixels):
+    # the original per pixel counts and the first strict maximum of each pixel
+    counts = [[0] * total_pixels for k in range(NUM_CLASSES)]
+    for land1 in lands:
+        for i in range(total_pixels):
+            k = LandClass.new_indices[land1[i]]
+            if k < NUM_CLASSES:
+                counts[k][i] += 1
+
+    cum_prob = []
+    cum_uncert = []
+    for i in range(total_pixels):
+        max_count = 0
+        max_class = 0
+        for k in range(NUM_CLASSES):
+            if counts[k][i] > max_count:
+                max_count = counts[k][i]
+                max_class = k
+        cum_prob.append(max_class)
+        cum_uncert.append(100 - (100 * max_count) / sum(counts[k][i] for k in range(NUM_CLASSES)))
+    return cum_prob, cum_uncert
+
+
+def test_prob_image_matches_pixel_loop(land_scenario):
+    total_pixels = 300
+    rng = np.random.default_rng(0)
+    # every pixel gets a class in the first replica, the others may hold unmapped values
+    lands = [rng.integers(0, NUM_CLASSES, total_pixels).astype(np.uint8) * 10]
+    for imc in range(11):
+        land1 = rng.integers(0, NUM_CLASSES, total_pixels).astype(np.uint8) * 10
+        land1[rng.random(total_pixels) < 0.1] = 7
+        lands.append(land1)
+
+    LandClass.init_annual_prob(total_pixels)
+    for land1 in lands:
+        LandClass.update_annual_prob(land1, total_pixels)
+    cum_prob, cum_uncert = LandClass.build_prob_image(total_pixels)
+
+    expected_prob, expected_uncert = pixel_prob(lands, total_pixels)
+    assert cum_prob.tolist() == expected_prob
+    assert cum_uncert.tolist() == pytest.approx(expected_uncert)
+
+
+def test_prob_image_exits_on_pixel_without_class(land_scenario, monkeypatch):
+    monkeypatch.setattr(Logger, "log_opened", True)
+    monkeypatch.setattr(Logger, "logfile", io.StringIO())
+    LandClass.init_annual_prob(4)
+    LandClass.update_annual_prob(np.array([0, 10, 7, 20], dtype=np.uint8), 4)
+    with pytest.raises(SystemExit):
+        LandClass.build_prob_image(4)
+    assert Logger.logfile.getvalue() == "Divide by zero: sum_grid[2] = 0\n"
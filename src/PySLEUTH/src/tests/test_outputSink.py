@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from outputSink import OutputSink
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def test_lines_reach_the_file_on_flush(tmp_path):
+    filename = str(tmp_path / "avg.log")
+    OutputSink.create(filename, "header\n")
+    OutputSink.write(filename, "run 0\n")
+    OutputSink.write_lines(filename, ["run 1\n", "run 2\n"])
+    assert open(filename).read() == "header\n"
+
+    OutputSink.flush()
+    assert open(filename).read() == "header\nrun 0\nrun 1\nrun 2\n"
+    OutputSink.close(filename)
+
+
+def test_create_keeps_or_replaces_the_file(tmp_path):
+    filename = str(tmp_path / "coeff.log")
+    OutputSink.create(filename, "header\n")
+    OutputSink.write(filename, "run 0\n")
+    OutputSink.create(filename, "restart\n", overwrite=False)
+    assert open(filename).read() == "header\nrun 0\nrestart\n"
+
+    OutputSink.create(filename, "header\n")
+    OutputSink.close(filename)
+    assert open(filename).read() == "header\n"
+
+
+def test_error_exit_drops_the_unfinished_run(tmp_path):
+    filename = str(tmp_path / "avg.log")
+    script = "import sys\n" \
+             "from outputSink import OutputSink\n" \
+             f"OutputSink.create({filename!r}, 'header\\n')\n" \
+             f"OutputSink.write({filename!r}, 'run 0\\n')\n" \
+             "OutputSink.flush()\n" \
+             f"OutputSink.write({filename!r}, 'half of run 1\\n')\n" \
+             "sys.exit(1)\n"
+    result = subprocess.run([sys.executable, "-c", script], cwd=SRC)
+    assert result.returncode == 1
+    assert open(filename).read() == "header\nrun 0\n"
@@ -0,0 +1,82 @@
+import numpy as np
+from rand import RandomBuffer, Random
+from processing import Processing
+
+
+def draw_mixed(buffer):
+    # a run of scalar and bulk draws that crosses several block boundaries
+    values = []
+    for n in (3, 250, 1, 700, 2, 5000, 70000, 9):
+        if n < 10:
+            values += [buffer.float() for k in range(n)]
+        else:
+            values += buffer.floats(n).tolist()
+    return values
+
+
+def test_draws_follow_the_generator_stream():
+    values = draw_mixed(RandomBuffer(42))
+    assert values == np.random.Generator(np.random.Philox(42)).random(len(values)).tolist()
+
+
+def test_bulk_draws_match_scalar_draws():
+    scalar = RandomBuffer(5)
+    bulk = RandomBuffer(5)
+    assert [scalar.int(3, 17) for k in range(1000)] == bulk.ints(1000, 3, 17).tolist()
+    assert [scalar.float() for k in range(100000)] == bulk.floats(100000).tolist()
+
+
+def test_skip_drops_draws():
+    taken = RandomBuffer(9)
+    skipped = RandomBuffer(9)
+    for n in (1, 255, 4000, 70000):
+        taken.floats(n)
+        skipped.skip(n)
+        assert taken.float() == skipped.float()
+
+
+def test_ints_cover_both_ends():
+    values = RandomBuffer(1).ints(10000, 0, 7)
+    assert values.min() == 0 and values.max() == 7
+
+
+def set_key(seed, run, monte, year):
+    Random.set_seed(seed)
+    Processing.set_current_run(run)
+    Processing.set_current_monte(monte)
+    Processing.set_current_year(year)
+
+
+def test_stream_is_the_keyed_philox_stream():
+    set_key(3, 2, 1, 1950)
+    Random.set_stream(Random.SPREAD_PHASE4)
+    expected = np.random.Generator(np.random.Philox(np.random.SeedSequence([3, 2, 1, 1950, Random.SPREAD_PHASE4])))
+    assert Random.get_floats(3000).tolist() == expected.random(3000).tolist()
+
+
+def test_stream_does_not_depend_on_earlier_draws():
+    set_key(3, 0, 4, 1961)
+    Random.set_stream(Random.DELTATRON_PHASE1)
+    first = [Random.get_float() for k in range(500)]
+
+    # draw from other streams and keys, then come back to the same key
+    for phase in (Random.SPREAD_PHASE1N3, Random.SPREAD_PHASE5):
+        Random.set_stream(phase)
+        Random.get_floats(70000)
+    set_key(3, 1, 0, 1930)
+    Random.set_stream(Random.DELTATRON_PHASE1)
+    Random.get_ints(10, 0, 7)
+
+    set_key(3, 0, 4, 1961)
+    Random.set_stream(Random.DELTATRON_PHASE1)
+    assert [Random.get_float() for k in range(500)] == first
+
+
+def test_streams_differ_by_every_key_part():
+    streams = set()
+    for key in [(3, 0, 0, 1950), (4, 0, 0, 1950), (3, 1, 0, 1950), (3, 0, 1, 1950), (3, 0, 0, 1951)]:
+        for phase in (Random.SPREAD_PHASE1N3, Random.SPREAD_PHASE4):
+            set_key(*key)
+            Random.set_stream(phase)
+            streams.add(tuple(Random.get_floats(4).tolist()))
+    assert len(streams) == 10
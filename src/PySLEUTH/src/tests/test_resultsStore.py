@@ -0,0 +1,59 @@
+import sqlite3
+from resultsStore import ResultsStore
+
+
+def make_row(run, coefficients, product):
+    metrics = (product,) + (0.5,) * (len(ResultsStore.METRICS) - 1)
+    return (run,) + metrics + coefficients + (4, 12.5)
+
+
+def read_rows(filename):
+    with sqlite3.connect(filename) as connection:
+        return connection.execute("SELECT run, product, diffusion, breed FROM runs ORDER BY diffusion, breed").fetchall()
+
+
+def test_rows_are_stored_in_columns_order(tmp_path):
+    filename = str(tmp_path / "control_stats.db")
+    row = make_row(0, (1, 2, 3, 4, 5), 0.25)
+    ResultsStore.add_run(filename, row)
+    with sqlite3.connect(filename) as connection:
+        stored = connection.execute(f"SELECT {', '.join(ResultsStore.COLUMNS)} FROM runs").fetchall()
+    assert stored == [row]
+
+
+def test_restarted_run_replaces_its_row(tmp_path):
+    filename = str(tmp_path / "control_stats.db")
+    ResultsStore.add_run(filename, make_row(0, (1, 1, 1, 1, 1), 0.1))
+    ResultsStore.add_run(filename, make_row(1, (25, 1, 1, 1, 1), 0.2))
+    ResultsStore.add_run(filename, make_row(1, (25, 1, 1, 1, 1), 0.3))
+    assert read_rows(filename) == [(0, 0.1, 1, 1), (1, 0.3, 25, 1)]
+
+
+def test_pieces_of_a_split_calibration_merge(tmp_path):
+    # every piece numbers its runs from 0, but sweeps its own coefficients
+    pieces = [str(tmp_path / f"piece_{k}.db") for k in range(2)]
+    for k, filename in enumerate(pieces):
+        for run, breed in enumerate((1, 50)):
+            ResultsStore.add_run(filename, make_row(run, (1 + k, breed, 1, 1, 1), 0.1 * (k + 1)))
+
+    merged = str(tmp_path / "merged.db")
+    ResultsStore.get_connection(merged)
+    with sqlite3.connect(merged) as connection:
+        for filename in pieces:
+            connection.execute("ATTACH DATABASE ? AS piece", (filename,))
+            connection.execute("INSERT INTO runs SELECT * FROM piece.runs")
+            connection.commit()
+            connection.execute("DETACH DATABASE piece")
+    assert read_rows(merged) == [(0, 0.1, 1, 1), (1, 0.1, 1, 50), (0, 0.2, 2, 1), (1, 0.2, 2, 50)]
+
+
+def test_captured_rows_are_not_written(tmp_path):
+    filename = str(tmp_path / "control_stats.db")
+    row = make_row(0, (1, 1, 1, 1, 1), 0.1)
+    ResultsStore.captured_rows = []
+    try:
+        ResultsStore.add_run(filename, row)
+        assert ResultsStore.captured_rows == [(filename, row)]
+    finally:
+        ResultsStore.captured_rows = None
+    assert not (tmp_path / "control_stats.db").exists()
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from roadIndex import RoadSearchIndex, RoadNetwork
+from rand import Random
+from ugm_defines import UGMDefines
+
+
+def spiral(index):
+    # (i, j) offset of a search index, as the original per index spiral computed it
+    bn = 1
+    while 8 * ((1 + bn) * bn) / 2 <= index:
+        bn += 1
+    bo = index - 8 * ((bn - 1) * bn / 2)
+    side = bn * 2 + 1
+    inner = bn * 2 - 1
+    if bo < side:
+        return -bn + bo, -bn
+    if bo < side + inner:
+        return bn, -bn + 1 + (bo - side)
+    if bo < 2 * side + inner:
+        return bn - (bo - side - inner), bn
+    return -bn, bn - 1 - (bo - 2 * side - inner)
+
+
+def spiral_search(i_center, j_center, max_search_index, roads, nrows, ncols):
+    for search_idx in range(max_search_index):
+        i_offset, j_offset = spiral(search_idx)
+        i = int(i_center + i_offset)
+        j = int(j_center + j_offset)
+        if 0 <= i < nrows and 0 <= j < ncols and roads[i * ncols + j] != 0:
+            return True, i, j
+    return False, 0, 0
+
+
+def test_spiral_offsets_match():
+    RoadSearchIndex.extend_spiral(400)
+    for index in range(400):
+        assert (RoadSearchIndex.spiral_i[index], RoadSearchIndex.spiral_j[index]) == spiral(index)
+
+
+@pytest.mark.parametrize("density", [0.0, 0.002, 0.02, 0.3])
+def test_search_matches_spiral_search(density):
+    rng = np.random.default_rng(7)
+    nrows, ncols = 37, 53
+    roads = np.where(rng.random(nrows * ncols) < density, rng.integers(1, 101, nrows * ncols), 0).astype(np.uint8)
+    index = RoadSearchIndex(roads, nrows, ncols)
+
+    for i in range(nrows):
+        for j in range(ncols):
+            for max_search_index in (8, 53, index.max_search_index):
+                assert index.search(i, j, max_search_index) == \
+                    spiral_search(i, j, max_search_index, roads, nrows, ncols)
+
+
+def pixel_walk(i, j, diffusion_coeff, roads, nrows, ncols):
+    # the original road walk over the road grid, stepping to the first road neighbor from a random direction
+    neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0)]
+    run = 0
+    while True:
+        end_of_road = True
+        idx = Random.get_int(0, 7)
+        for k in range(8):
+            di, dj = neighbor_options[(idx + k) % 8]
+            if 0 <= i + di < nrows and 0 <= j + dj < ncols and roads[(i + di) * ncols + j + dj] != 0:
+                end_of_road = False
+                run += 1
+                i += di
+                j += dj
+                break
+        if run > int(roads[i * ncols + j] / UGMDefines.MAX_ROAD_VALUE * diffusion_coeff):
+            return True, i, j
+        if end_of_road:
+            return False, 0, 0
+
+
+@pytest.mark.parametrize("diffusion_coeff", [1, 25, 100])
+def test_walk_matches_pixel_walk(diffusion_coeff):
+    rng = np.random.default_rng(11)
+    nrows, ncols = 31, 29
+    roads = np.where(rng.random(nrows * ncols) < 0.35, rng.integers(1, 101, nrows * ncols), 0).astype(np.uint8)
+    network = RoadNetwork(roads, nrows, ncols)
+
+    for seed, start in enumerate(np.flatnonzero(roads).tolist()):
+        i, j = divmod(start, ncols)
+        Random.set_seed(seed)
+        expected = pixel_walk(i, j, diffusion_coeff, roads, nrows, ncols)
+        Random.set_seed(seed)
+        assert network.walk(i, j, diffusion_coeff) == expected
@@ -0,0 +1,111 @@
+import math
+from collections import OrderedDict
+import numpy as np
+import pytest
+from coeff import Coeff, CoeffInfo
+from rand import Random
+from scenario import Scenario
+from spread import Spread
+from stats import Stats
+from ugm_defines import UGMDefines
+
+
+def pixel_neighbors(urban):
+    # the original count: urban neighbors of every interior pixel, (-1, -1) listed twice
+    nrows, ncols = urban.shape
+    neighbor_options = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+    counts = np.zeros((nrows, ncols), dtype=int)
+    for i in range(1, nrows - 1):
+        for j in range(1, ncols - 1):
+            counts[i, j] = sum(urban[i + x, j + y] for x, y in neighbor_options)
+    return counts
+
+
+def serial_urbanize(offsets, z, delta, slope, excld, slope_weights, floats, ints, pixel_val):
+    # urbanize once per offset, in order; attempts on pixels free at the start own one float and one int each
+    failures = [0, 0, 0, 0]
+    draw = np.cumsum((z[offsets] == 0) & (delta[offsets] == 0)) - 1
+    stat = 0
+    for k, offset in enumerate(offsets.tolist()):
+        if z[offset] != 0:
+            failures[0] += 1
+        elif delta[offset] != 0:
+            failures[1] += 1
+        elif floats[draw[k]] <= slope_weights[slope[offset]]:
+            failures[2] += 1
+        elif excld[offset] >= ints[draw[k]]:
+            failures[3] += 1
+        else:
+            delta[offset] = pixel_val
+            stat += 1
+    return stat, failures
+
+
+@pytest.mark.parametrize("density", [0.0, 0.3, 0.9])
+def test_count_neighbors_matches_pixel_loop(density):
+    urban = np.random.default_rng(1).random((17, 21)) < density
+    assert Spread.count_neighbors(urban).tolist() == pixel_neighbors(urban).tolist()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_urbanize_all_matches_serial_urbanize(monkeypatch, seed):
+    rng = np.random.default_rng(seed)
+    size = 400
+    z = (rng.random(size) < 0.2).astype(np.uint8)
+    delta = (rng.random(size) < 0.1).astype(np.uint8)
+    slope = rng.integers(0, 256, size).astype(np.uint8)
+    excld = np.where(rng.random(size) < 0.2, 100, rng.integers(0, 60, size)).astype(np.uint8)
+    slope_weights = rng.random(256)
+    # repeated offsets, so later attempts find pixels an earlier attempt took
+    offsets = rng.integers(0, 60, 300)
+
+    floats = rng.random(len(offsets))
+    ints = rng.integers(0, 100, len(offsets))
+    monkeypatch.setattr(Random, "get_floats", lambda num: floats[:num])
+    monkeypatch.setattr(Random, "get_ints", lambda num, low, high: ints[:num])
+
+    expected_delta = delta.copy()
+    expected, failures = serial_urbanize(offsets, z, expected_delta, slope, excld, slope_weights, floats, ints, 7)
+
+    Stats.init_urbanization_attempts()
+    stat = Spread.urbanize_all(offsets, z, delta, slope, excld, slope_weights, 7, 0)
+    attempt = Stats.urbanization_attempt
+    assert stat == expected
+    assert delta.tolist() == expected_delta.tolist()
+    assert [attempt.z_failure, attempt.delta_failure, attempt.slope_failure, attempt.excluded_failure] == failures
+
+
+@pytest.fixture
+def slope_scenario(monkeypatch):
+    monkeypatch.setattr(Scenario, "scenario", {"critical_slope": "21", "logging": False})
+    monkeypatch.setattr(Spread, "slope_cache", OrderedDict())
+
+
+def set_slope_resistance(monkeypatch, slope_resist):
+    monkeypatch.setattr(Coeff, "current_coefficient", CoeffInfo(slope_resistance=slope_resist))
+
+
+@pytest.mark.parametrize("slope_resist", [1, 37, 100])
+def test_slope_weights_match_original_table(slope_scenario, slope_resist):
+    # the original per entry table
+    exp = slope_resist / (UGMDefines.MAX_SLOPE_RESISTANCE_VALUE / 2)
+    expected = [1.0 - math.pow(21 - 1 / 21, exp) if i < 21 else 1.0 for i in range(256)]
+    assert Spread.build_slope_weights(slope_resist).tolist() == expected
+
+
+def test_slope_weights_cache(monkeypatch, slope_scenario):
+    set_slope_resistance(monkeypatch, 5)
+    first = Spread.get_slope_weights()
+    assert Spread.get_slope_weights() is first
+
+    # the least recently used table goes once the cache is full
+    for slope_resist in range(6, 6 + Spread.SLOPE_CACHE_SIZE):
+        set_slope_resistance(monkeypatch, slope_resist)
+        Spread.get_slope_weights()
+    assert len(Spread.slope_cache) == Spread.SLOPE_CACHE_SIZE
+    assert 5 not in Spread.slope_cache
+
+    set_slope_resistance(monkeypatch, 5)
+    rebuilt = Spread.get_slope_weights()
+    assert rebuilt is not first
+    assert rebuilt.tolist() == first.tolist()
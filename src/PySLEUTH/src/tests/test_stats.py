@@ -0,0 +1,100 @@
+import math
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from globals import Globals
+from grid import Grid
+from igrid import IGrid
+from pgrid import PGrid
+from processing import Processing
+from scenario import Scenario
+from stats import Record, Stats, StatsInfo
+from statsTracker import StatsTracker
+
+
+@pytest.fixture
+def grid_shape(monkeypatch):
+    monkeypatch.setattr(IGrid, "nrows", 23)
+    monkeypatch.setattr(IGrid, "ncols", 31)
+    return 23, 31
+
+
+def random_urban(shape, density, seed):
+    rng = np.random.default_rng(seed)
+    return (rng.random(shape[0] * shape[1]) < density).astype(np.uint8) * rng.integers(1, 5, shape[0] * shape[1],
+                                                                                      dtype=np.uint8)
+
+
+def pixel_edges(urban, nrows, ncols):
+    # the original per pixel count: an urban pixel with a non urban 4-neighbor inside the grid is an edge
+    edges = 0
+    area = 0
+    for i in range(nrows):
+        for j in range(ncols):
+            if urban[i * ncols + j] != 0:
+                area += 1
+                for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                    if 0 <= ni < nrows and 0 <= nj < ncols and urban[ni * ncols + nj] == 0:
+                        edges += 1
+                        break
+    return edges, area
+
+
+@pytest.mark.parametrize("density", [0.05, 0.5, 0.95, 1.0])
+def test_set_edge_matches_pixel_count(grid_shape, density):
+    urban = random_urban(grid_shape, density, 3)
+    stats_info = StatsInfo()
+    Stats.set_edge(urban, stats_info)
+    assert (stats_info.edges, stats_info.area) == pixel_edges(urban, *grid_shape)
+
+
+def test_set_circle_matches_pixel_means(grid_shape):
+    nrows, ncols = grid_shape
+    urban = random_urban(grid_shape, 0.3, 4)
+    slope = np.random.default_rng(5).integers(0, 60, nrows * ncols).astype(np.uint8)
+    stats_info = StatsInfo()
+    Stats.set_edge(urban, stats_info)
+    Stats.set_circle(urban, slope, stats_info)
+
+    pixels = [(i, j) for i in range(nrows) for j in range(ncols) if urban[i * ncols + j] > 0]
+    assert stats_info.x_mean == pytest.approx(sum(j for i, j in pixels) / len(pixels))
+    assert stats_info.y_mean == pytest.approx(sum(i for i, j in pixels) / len(pixels))
+    assert stats_info.average_slope == pytest.approx(sum(int(slope[i * ncols + j]) for i, j in pixels) / len(pixels))
+    assert stats_info.radius == pytest.approx(math.sqrt(len(pixels) / math.pi))
+
+
+@pytest.fixture
+def control_years(monkeypatch, grid_shape):
+    nrows, ncols = grid_shape
+    slope = np.random.default_rng(6).integers(0, 60, nrows * ncols).astype(np.uint8)
+    urban = [SimpleNamespace(year=year) for year in (1990, 1995, 2000)]
+    monkeypatch.setattr(IGrid, "igrid", SimpleNamespace(urban=urban, get_num_urban=lambda: len(urban),
+                                                        get_slope_grid=lambda: slope))
+    monkeypatch.setattr(Scenario, "scenario", {"logging": False})
+    return slope
+
+
+@pytest.mark.parametrize("mode, saved", [("calibrate", [1990, 1995, 2000]), ("test", [1990, 1995, 2000]),
+                                         ("predict", list(range(1990, 2001)))])
+def test_saved_years(monkeypatch, control_years, mode, saved):
+    monkeypatch.setattr(Processing, "type_of_processing", Globals.mode_enum[mode])
+    assert [year for year in range(1990, 2001) if Stats.is_saved_year(year)] == saved
+
+
+def test_tracked_year_stats_match_full_stats(monkeypatch, grid_shape, control_years):
+    nrows, ncols = grid_shape
+    z = Grid()
+    z.gridData = random_urban(grid_shape, 0.3, 7)
+    monkeypatch.setattr(PGrid, "z", z)
+    monkeypatch.setattr(Stats, "record", Record())
+
+    monkeypatch.setattr(Stats, "tracker", None)
+    full_pop = Stats.compute_cur_year_pop()
+    Stats.compute_cur_year_stats()
+    full = Stats.record.this_year.get_values().tolist()
+
+    monkeypatch.setattr(Stats, "tracker", StatsTracker(z.gridData, control_years, nrows, ncols))
+    monkeypatch.setattr(Stats, "record", Record())
+    assert Stats.compute_cur_year_pop() == full_pop == np.count_nonzero(z.gridData)
+    Stats.compute_cur_year_stats()
+    assert Stats.record.this_year.get_values().tolist() == pytest.approx(full)
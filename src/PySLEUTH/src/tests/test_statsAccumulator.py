@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from statsAccumulator import StatsAccumulator
+from statsVal import StatsVal
+
+
+def make_records(num, seed):
+    rng = np.random.default_rng(seed)
+    records = []
+    for k in range(num):
+        stats_val = StatsVal()
+        stats_val.set_values(rng.normal(1e6, 50.0, len(StatsVal.FIELDS)) * rng.integers(0, 2, len(StatsVal.FIELDS)))
+        records.append(stats_val)
+    return records
+
+
+def two_pass(records):
+    values = np.array([record.get_values() for record in records])
+    return values.sum(axis=0), np.sqrt(((values - values.mean(axis=0)) ** 2).mean(axis=0))
+
+
+def test_add_matches_two_pass():
+    records = make_records(25, 1)
+    accumulator = StatsAccumulator()
+    for record in records:
+        accumulator.add(0, 1950, record)
+
+    sums, std_dev = two_pass(records)
+    assert accumulator.get_count(0, 1950) == 25
+    assert accumulator.get_average(0, 1950, 25).get_values() == pytest.approx(sums / 25, rel=1e-12)
+    assert accumulator.get_std_dev(0, 1950).get_values() == pytest.approx(std_dev, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("split", [[1, 24], [12, 13], [5, 1, 9, 10]])
+def test_merge_matches_two_pass(split):
+    records = make_records(25, 2)
+    merged = StatsAccumulator()
+    start = 0
+    for size in split:
+        part = StatsAccumulator()
+        for record in records[start:start + size]:
+            part.add(3, 1990, record)
+        merged.merge(part)
+        start += size
+
+    sums, std_dev = two_pass(records)
+    assert merged.get_count(3, 1990) == 25
+    assert merged.get_average(3, 1990, 25).get_values() == pytest.approx(sums / 25, rel=1e-12)
+    assert merged.get_std_dev(3, 1990).get_values() == pytest.approx(std_dev, rel=1e-9, abs=1e-9)
+
+
+def test_entries_are_kept_per_run_and_year():
+    records = make_records(3, 3)
+    accumulator = StatsAccumulator()
+    accumulator.add(0, 1950, records[0])
+    accumulator.add(0, 1951, records[1])
+    accumulator.add(1, 1950, records[2])
+    assert accumulator.get_average(0, 1951, 1).get_values().tolist() == records[1].get_values().tolist()
+    assert accumulator.get_std_dev(1, 1950).get_values().tolist() == [0.0] * len(StatsVal.FIELDS)
+
+    accumulator.remove(0, 1950)
+    assert accumulator.get_count(0, 1950) == 0
+    assert accumulator.get_count(1, 1950) == 1
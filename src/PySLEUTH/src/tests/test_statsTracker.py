@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from clusterLabel import ClusterLabel
+from statsTracker import StatsTracker
+
+
+def full_stats(urban, slope, nrows, ncols):
+    # the yearly statistics recomputed from the whole grid
+    urban_2d = urban.reshape(nrows, ncols) != 0
+    padded = np.pad(urban_2d, 1, constant_values=True)
+    edge = urban_2d & ~(padded[:-2, 1:-1] & padded[2:, 1:-1] & padded[1:-1, :-2] & padded[1:-1, 2:])
+    rows, cols = np.nonzero(urban_2d)
+    clusters, cluster_pixels = ClusterLabel.count_clusters(urban_2d[1:-1, 1:-1])
+    return (len(rows), int(np.count_nonzero(edge)), clusters, cluster_pixels, int(cols.sum()), int(rows.sum()),
+            int(slope[urban != 0].sum()))
+
+
+def tracked_stats(tracker):
+    return (tracker.area, tracker.edges, tracker.clusters, tracker.cluster_pixels, tracker.x_sum, tracker.y_sum,
+            tracker.slope_sum)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_yearly_growth_matches_full_stats(seed):
+    rng = np.random.default_rng(seed)
+    nrows, ncols = 29, 37
+    slope = rng.integers(0, 60, nrows * ncols).astype(np.uint8)
+    urban = (rng.random(nrows * ncols) < 0.05).astype(np.uint8)
+    tracker = StatsTracker(urban, slope, nrows, ncols)
+    assert tracked_stats(tracker) == full_stats(urban, slope, nrows, ncols)
+
+    # years of growth, from a few scattered pixels to most of the grid, border pixels included
+    for year in range(12):
+        non_urban = np.flatnonzero(urban == 0)
+        growth = rng.choice(non_urban, size=min(len(non_urban), 3 + year * 25), replace=False)
+        urban[growth] = 1
+        tracker.add(np.sort(growth))
+        assert tracked_stats(tracker) == full_stats(urban, slope, nrows, ncols)
+
+    assert tracker.get_mean_cluster_size() == tracker.cluster_pixels / tracker.clusters
+
+
+def test_no_growth_changes_nothing():
+    urban = np.zeros(100, dtype=np.uint8)
+    urban[[11, 12, 55]] = 1
+    tracker = StatsTracker(urban, np.zeros(100, dtype=np.uint8), 10, 10)
+    before = tracked_stats(tracker)
+    tracker.add(np.zeros(0, dtype=np.int64))
+    assert tracked_stats(tracker) == before
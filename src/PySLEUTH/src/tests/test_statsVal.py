@@ -0,0 +1,24 @@
+import pickle
+import pytest
+from statsVal import StatsVal
+from stats import StatsInfo, Record
+
+
+def test_stats_val_pickles_its_values():
+    stats_val = StatsVal()
+    stats_val.set_values(stats_val.get_values() + range(len(StatsVal.FIELDS)))
+    copy = pickle.loads(pickle.dumps(stats_val))
+    assert copy.get_values().tolist() == stats_val.get_values().tolist()
+
+
+def test_stats_info_values_round_trip():
+    stats_info = StatsInfo()
+    values = [float(k) for k in range(len(StatsInfo.FIELDS))]
+    stats_info.set_values(values)
+    assert list(stats_info.get_values()) == values
+
+
+@pytest.mark.parametrize("cls", [StatsVal, StatsInfo, Record])
+def test_slots_reject_unknown_fields(cls):
+    with pytest.raises(AttributeError):
+        cls().misspelled_field = 1.0
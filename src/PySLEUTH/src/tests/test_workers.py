@@ -0,0 +1,68 @@
+import os
+import re
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample data")
+
+
+def run_model(tmp_path, mode, scenario, settings, workers):
+    """
+    Runs main.py on a demo200 sample scenario with some settings replaced and returns its output directory.
+    The scenario paths may not hold spaces, so the inputs are linked next to a scratch working directory.
+    """
+    if not os.path.exists(tmp_path / "Input"):
+        os.symlink(os.path.join(SAMPLE, "Input"), tmp_path / "Input")
+    name = f"{scenario}_{workers}"
+    os.makedirs(tmp_path / "work", exist_ok=True)
+    os.makedirs(tmp_path / "Output" / name)
+
+    settings = dict(settings, OUTPUT_DIR=f"../Output/{name}/")
+    lines = []
+    with open(os.path.join(SAMPLE, "Scenarios", "demo200", scenario)) as file:
+        for line in file:
+            key = line.split("=")[0].split("(")[0].strip()
+            if not line.startswith("#") and key in settings:
+                line = f"{line.split('=')[0]}={settings[key]}\n"
+            lines.append(line)
+    scenario_path = tmp_path / f"scenario.{name}"
+    scenario_path.write_text("".join(lines))
+
+    args = [sys.executable, os.path.join(SRC, "main.py"), mode, str(scenario_path)]
+    if workers > 1:
+        args += ["--workers", str(workers)]
+    result = subprocess.run(args, cwd=tmp_path / "work", capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return tmp_path / "Output" / name
+
+
+def read_outputs(output_dir):
+    # every output file but the log, whose timings differ from run to run
+    return {name: (output_dir / name).read_bytes() for name in os.listdir(output_dir) if name != "LOG_0"}
+
+
+def read_timer_calls(output_dir):
+    # number of calls of every timer in the timing table at the end of the log
+    log = (output_dir / "LOG_0").read_text()
+    table = log[log.rindex("LOG OF TIMINGS"):]
+    return re.findall(r"^(\w+)\s+(\d+)\s+[\d.]+\s+[\d.]+ =", table, re.MULTILINE)
+
+
+def test_monte_carlo_workers_match_serial(tmp_path):
+    serial = run_model(tmp_path, "test", "scenario.demo200_test", {}, 1)
+    parallel = run_model(tmp_path, "test", "scenario.demo200_test", {}, 3)
+    assert read_outputs(parallel) == read_outputs(serial)
+    assert len(read_timer_calls(serial)) > 0
+    assert read_timer_calls(parallel) == read_timer_calls(serial)
+
+
+def test_calibration_workers_match_serial(tmp_path):
+    settings = {"MONTE_CARLO_ITERATIONS": 1, "CALIBRATION_BREED_STOP": 0, "CALIBRATION_SPREAD_STOP": 0,
+                "CALIBRATION_SLOPE_STOP": 0, "CALIBRATION_ROAD_STOP": 0, "WRITE_COEFF_FILE": "yes",
+                "WRITE_AVG_FILE": "yes", "WRITE_STD_DEV_FILE": "yes"}
+    serial = run_model(tmp_path, "calibrate", "scenario.demo200_calibrate", settings, 1)
+    parallel = run_model(tmp_path, "calibrate", "scenario.demo200_calibrate", settings, 2)
+    assert len((serial / "control_stats.log").read_text().splitlines()) == 4
+    assert read_outputs(parallel) == read_outputs(serial)
+    assert read_timer_calls(parallel) == read_timer_calls(serial)